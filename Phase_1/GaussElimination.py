@@ -1,19 +1,16 @@
 import numpy as np
 
+from bandedSolvers import detect_bandwidth, is_narrow_band, solve_dense_banded
+from exactSolver import exact_solve
+from pivoting import Pivoter
+from rankOneUpdate import subtract_outer
+from stepLog import StepLog
 
-def scale(matrix):
-    scaling_factors = np.max(np.abs(matrix), axis=1)
-    return matrix / scaling_factors[:, np.newaxis]
 
-
-def pivoting(matrix, start_row, use_scaling):
-    copy_matrix = matrix.copy()
-    if use_scaling:
-        copy_matrix = scale(copy_matrix)
-    max_idx = abs(copy_matrix[start_row:, start_row]).argmax() + start_row
-    if copy_matrix[start_row, start_row] == 0:
-        raise ValueError(f"Zero pivot encountered at row {start_row} while pivoting.")
-    matrix[start_row], matrix[max_idx] = matrix[max_idx].copy(), matrix[start_row].copy()
+def pivoter_for(Ab, use_scaling, strategy=None):
+    # use_scaling picks scaled partial pivoting unless a strategy is named
+    strategy = strategy or ('scaled' if use_scaling else 'partial')
+    return Pivoter(Ab, strategy, ncols=Ab.shape[1] - 1)
 
 
 def normalize_rows(Ab):
@@ -26,82 +23,167 @@ def normalize_rows(Ab):
     return Ab
 
 
-def forward_elimination_generator(A, b, use_scaling):
-    Ab = np.column_stack((A, b))
+def augment(A, b):
+    return np.column_stack((A, b)).astype(float, copy=False)
+
+
+def eliminate_below(Ab, pivot):
+    # One rank-1 update of the trailing block replaces the row-by-row loop.
+    factors = Ab[pivot + 1:, pivot] / Ab[pivot, pivot]
+    subtract_outer(Ab[pivot + 1:, pivot + 1:], factors, Ab[pivot, pivot + 1:])
+    Ab[pivot + 1:, pivot] = 0
+    return factors
+
+
+def eliminate_above(Ab, pivot):
+    factors = Ab[:pivot, pivot] / Ab[pivot, pivot]
+    subtract_outer(Ab[:pivot, pivot + 1:], factors, Ab[pivot, pivot + 1:])
+    Ab[:pivot, pivot] = 0
+    return factors
+
+
+def check_consistent(Ab, pivot):
+    if np.all(Ab[pivot, :-1] == 0) and Ab[pivot, -1] != 0:
+        raise ValueError(f"Inconsistent system: No solution at row {pivot}.")
+
+
+def check_pivot(Ab, pivot):
+    if Ab[pivot, pivot] == 0:
+        raise ValueError(f"Zero pivot encountered at row {pivot} while pivoting.")
+
+
+def forward_step(Ab, pivot, pivoter):
+    pivoter.apply(pivot)
+    check_pivot(Ab, pivot)
+    eliminate_below(Ab, pivot)
+    check_consistent(Ab, pivot)
+
+
+def forward_steps(Ab, pivoter):
+    for pivot in range(len(Ab) - 1):
+        forward_step(Ab, pivot, pivoter)
+        yield Ab
+
+
+def forward_elimination_generator(A, b, use_scaling, strategy=None):
+    Ab = augment(A, b)
+    yield from forward_steps(Ab, pivoter_for(Ab, use_scaling, strategy))
+
+
+def forward_elimination(A, b, use_scaling, strategy=None):
+    """Fast path of ``forward_elimination_generator``: same steps, nothing yielded."""
+    Ab = augment(A, b)
+    pivoter = pivoter_for(Ab, use_scaling, strategy)
+    for pivot in range(len(Ab) - 1):
+        forward_step(Ab, pivot, pivoter)
+    return Ab
+
+
+def forward_elimination_log(A, b, use_scaling, checkpoint_interval=None, strategy=None):
+    """Forward elimination recorded as a ``StepLog``: one step per pivot, as in the generator."""
     n = len(b)
+    # at most one swap and one block elimination per step
+    log = StepLog(augment(A, b), checkpoint_interval, expected_ops=2 * (n - 1))
+    Ab = log.current
+    pivoter = pivoter_for(Ab, use_scaling, strategy)
+    if pivoter.permutes_columns:
+        raise ValueError("The step log records row interchanges only; use none, partial or scaled pivoting.")
 
     for pivot in range(n - 1):
-        pivoting(Ab, pivot, use_scaling)
-        for row in range(pivot + 1, n):
-            factor = Ab[row, pivot] / Ab[pivot, pivot]
-            Ab[row] -= factor * Ab[pivot]
-        if np.all(Ab[pivot, :-1] == 0) and Ab[pivot, -1] != 0:
-            raise ValueError(f"Inconsistent system: No solution at row {pivot}.")
-        yield Ab
+        row, _ = pivoter.apply(pivot)
+        log.swap(pivot, row, applied=True)
+        check_pivot(Ab, pivot)
+        log.eliminate(pivot + 1, pivot, Ab[pivot + 1:, pivot] / Ab[pivot, pivot], pivot)
+        check_consistent(Ab, pivot)
+        log.end_step()
+    return log
 
 
 def backward_substitution(Ab):
     n = len(Ab)
     x = np.zeros(n)
     for i in reversed(range(n)):
-        rhs = Ab[i, n]
-        for j in range(i + 1, n):
-            rhs -= x[j] * Ab[i, j]
-        x[i] = rhs / Ab[i, i]
+        x[i] = (Ab[i, n] - Ab[i, i + 1:n] @ x[i + 1:]) / Ab[i, i]
     return x
 
 
 def backward_elimination(Ab):
-    n = len(b)
+    n = len(Ab)
 
     for pivot in reversed(range(1, n)):
-        for row in reversed(range(pivot)):
-            factor = Ab[row, pivot] / Ab[pivot, pivot]
-            Ab[row] -= factor * Ab[pivot]
+        eliminate_above(Ab, pivot)
         yield Ab
 
 
-def gauss_generator(A, b, use_scaling):
-    for Ab in forward_elimination_generator(A, b, use_scaling):
-        yield Ab
-
-    x = backward_substitution(Ab)
+def solution_matrix(x):
     n = len(x)
-
     answer = np.zeros((n, n + 1))
-    for i in range(n):
-        answer[i, i] = 1
-        answer[i, n] = x[i]
-    yield answer
+    answer[np.arange(n), np.arange(n)] = 1
+    answer[:, n] = x
+    return answer
 
 
-def gauss_gordan_generator(A, b, use_scaling):
-    for Ab in forward_elimination_generator(A, b, use_scaling):
+def gauss_generator(A, b, use_scaling, strategy=None):
+    Ab = augment(A, b)
+    pivoter = pivoter_for(Ab, use_scaling, strategy)
+    for Ab in forward_steps(Ab, pivoter):
         yield Ab
-    for Ab in backward_elimination(Ab):
-        yield Ab
-    yield normalize_rows(Ab)
-
-
-def gauss(A, b, use_scaling):
-    return list(gauss_generator(A, b, use_scaling))[-1][:, -1]
-
 
-def gauss_gordon(A, b, use_scaling):
-    return list(gauss_gordan_generator(A, b, use_scaling))[-1][:, -1]
+    yield solution_matrix(pivoter.unpermute(backward_substitution(Ab)))
 
 
-# TESTs
-a = np.array([
-    [-4, 5, 8, -9],
-    [4, 3, -7, 8],
-    [6, 8, 7, 4],
-    [1, -5, 8, 3]
-], dtype=float)
-b = np.array([10, 25, 6, 7], dtype=float)
-
-Ab = np.column_stack((a, b))
-solution = np.linalg.solve(a, b)
-print(solution)
-print(gauss(a, b, True))
-print(gauss_gordon(a, b, True))
+def gauss_gordan_generator(A, b, use_scaling, strategy=None):
+    Ab = augment(A, b)
+    pivoter = pivoter_for(Ab, use_scaling, strategy)
+    for Ab in forward_steps(Ab, pivoter):
+        yield Ab
+    for Ab in backward_elimination(Ab):
+        yield Ab
+    Ab = normalize_rows(Ab)
+    yield solution_matrix(pivoter.unpermute(Ab[:, -1])) if pivoter.permutes_columns else Ab
+
+
+def gauss(A, b, use_scaling, strategy=None, exact=False):
+    # exact mode: Bareiss fraction-free elimination on integers, returning Fractions
+    if exact:
+        return exact_solve(A, b)
+    # narrow-band matrices go through band storage in O(n (kl + ku)^2) instead of O(n^3)
+    kl, ku = detect_bandwidth(A)
+    if strategy is None and is_narrow_band(A, kl, ku):
+        return solve_dense_banded(A, b, kl, ku)
+    Ab = augment(A, b)
+    pivoter = pivoter_for(Ab, use_scaling, strategy)
+    for pivot in range(len(Ab) - 1):
+        forward_step(Ab, pivot, pivoter)
+    return pivoter.unpermute(backward_substitution(Ab))
+
+
+def gauss_gordon(A, b, use_scaling, strategy=None, exact=False):
+    if exact:
+        return exact_solve(A, b)
+    Ab = augment(A, b)
+    pivoter = pivoter_for(Ab, use_scaling, strategy)
+    for pivot in range(len(Ab) - 1):
+        forward_step(Ab, pivot, pivoter)
+    for pivot in reversed(range(1, len(Ab))):
+        eliminate_above(Ab, pivot)
+    return pivoter.unpermute(normalize_rows(Ab)[:, -1])
+
+
+def main():
+    a = np.array([
+        [-4, 5, 8, -9],
+        [4, 3, -7, 8],
+        [6, 8, 7, 4],
+        [1, -5, 8, 3]
+    ], dtype=float)
+    b = np.array([10, 25, 6, 7], dtype=float)
+
+    solution = np.linalg.solve(a, b)
+    print(solution)
+    print(gauss(a, b, True))
+    print(gauss_gordon(a, b, True))
+
+
+if __name__ == "__main__":
+    main()
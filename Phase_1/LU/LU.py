@@ -1,7 +1,19 @@
+import os
+import sys
+
 import numpy as np
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import systemType
+from factorizationCache import get_cache
+from pivoting import Pivoter, scale_factors
+from rankOneUpdate import subtract_outer
+from stepLog import StepLog
+
 class LU:
-    def __init__(self, matrix, B):
+    def __init__(self, matrix, B, exact=False):
+       # exact: classify integer or rational systems with fraction-free elimination
+       self.exact = exact
        self.factors = []  # Changed from zeros to list
        self.tol = 1e-9
        self.array = matrix.copy()
@@ -18,39 +30,14 @@ class LU:
        self.L = np.zeros((len(self.array), len(self.array)))
        self.solution_type = self.detect_system_type()
     
-    def detect_system_type(self):
-        A = self.coefficient_matrix
-        Aug = np.column_stack((A, self.constant_vector))
-        rank_A = np.linalg.matrix_rank(A)
-        rank_Aug = np.linalg.matrix_rank(Aug)
-        n = A.shape[1]
-        
-        if rank_A == rank_Aug:
-            if rank_A == n:
-                self.solution_type = 'unique'
-                return 'unique'
-            else:
-                self.solution_type = 'infinite'
-                return 'infinite'
-        else:
-            self.solution_type = 'no solution'
-            return 'no solution'
+    def detect_system_type(self, svd_fallback=False):
+        self.solution_type = systemType.classify_system(
+            self.coefficient_matrix, self.constant_vector, svd_fallback=svd_fallback, exact=self.exact)
+        return self.solution_type
            
     def scaling(self):
-        arr = self.array
-        scalers = [0] * len(arr)
-       
-        for i in range(len(arr)):
-            max_val = abs(arr[i][0])
-            for j in range(1, len(arr)):
-                if abs(arr[i][j]) > max_val:
-                   max_val = abs(arr[i][j])
-        
-            scalers[i] = max_val
-        
-        self.scalers = scalers
-       
-        return scalers
+        self.scalers = scale_factors(self.array)
+        return self.scalers
     
     def get_U_generator(self):
         if self.solution_type == 'no solution':
@@ -84,6 +71,28 @@ class LU:
 
         yield self.U.copy()
     
+    def get_U_log(self, checkpoint_interval=None):
+        """Same steps as ``get_U_generator``, recorded as a ``StepLog`` of row updates."""
+        if self.solution_type == 'no solution':
+            raise Exception("There is no solution")
+
+        if self.solution_type == 'infinite':
+            raise Exception("There is an infinite number of solutions")
+
+        log = StepLog(self.array, checkpoint_interval)
+        arr = log.current
+        rows = len(arr)
+
+        for k in range(rows):
+            for i in range(k + 1, rows):
+                factor = arr[i][k] / arr[k][k]
+                self.factors.append(factor)
+                log.eliminate(i, k, factor, k)
+                log.end_step()
+
+        self.U = arr.copy()
+        return log
+
     def forward_substitution_generator(self):
         if self.solution_type == 'no solution':
             raise Exception("There is no solution")
@@ -188,7 +197,91 @@ class LU:
         return U,self.L,F_res,results       
         
 
+def lu_factor(matrix, overwrite_a=False, tol=1e-9, strategy='partial', dtype=np.float64):
+    """Packed LU with row pivoting: ``A[perm] = L @ U``.
+
+    L (unit diagonal, below the diagonal) and U (on and above it) share one
+    array. With ``overwrite_a=True`` a float ndarray is factored in place.
+    ``strategy`` is 'none', 'partial' or 'scaled' (see ``pivoting``), and
+    ``dtype`` the floating point type the factorization is computed in.
+    """
+    if overwrite_a and isinstance(matrix, np.ndarray) and matrix.dtype == dtype:
+        lu = matrix
+    else:
+        lu = np.array(matrix, dtype=dtype)
+    if lu.ndim != 2 or lu.shape[0] != lu.shape[1]:
+        raise ValueError("Matrix must be square")
+
+    pivoter = Pivoter(lu, strategy)
+    if pivoter.permutes_columns:
+        raise ValueError("LU factorization supports row pivoting only: 'none', 'partial' or 'scaled'")
+    # largest |entry| without an n x n np.abs temporary
+    scale = max(lu.max(), -lu.min()) if lu.size else 0
+
+    for k in range(len(lu)):
+        pivoter.apply(k)
+        if scale == 0 or abs(lu[k, k]) < tol * scale:
+            raise ValueError(f"Zero pivot encountered at row {k}. Matrix is singular.")
+        lu[k + 1:, k] /= lu[k, k]
+        subtract_outer(lu[k + 1:, k + 1:], lu[k + 1:, k], lu[k, k + 1:])
+
+    return lu, pivoter.row_perm
+
+
+def lu_solve(lu, perm, B):
+    """Solve with a packed factorization for ``(n,)`` or ``(n, m)`` right-hand sides.
+
+    The substitutions run in the precision of ``lu``.
+    """
+    X = np.array(B, dtype=lu.dtype)[perm]
+    n = len(lu)
+    for i in range(1, n):
+        X[i] -= lu[i, :i] @ X[:i]
+    for i in reversed(range(n)):
+        X[i] = (X[i] - lu[i, i + 1:] @ X[i + 1:]) / lu[i, i]
+    return X
+
+
+class LUFactorization:
+    """Factor a coefficient matrix once and solve it against many right-hand sides."""
+
+    def __init__(self, matrix, tol=1e-9, overwrite_a=False, strategy='partial'):
+        self.tol = tol
+        self.lu, self.perm = lu_factor(matrix, overwrite_a, tol, strategy)
+        self.n = len(self.lu)
+
+    @classmethod
+    def cached(cls, matrix, tol=1e-9):
+        """Reuse the factorization of a matrix seen before, from the shared cache."""
+        return get_cache().get_or_factor(matrix, ('lu', tol), lambda A: cls(A, tol))
+
+    @property
+    def L(self):
+        return np.tril(self.lu, -1) + np.eye(self.n)
+
+    @property
+    def U(self):
+        return np.triu(self.lu)
+
+    @property
+    def P(self):
+        return np.eye(self.n)[self.perm]
+
+    def solve(self, B):
+        """Solve for a vector ``(n,)`` or a matrix ``(n, m)`` of right-hand sides in O(n^2) each."""
+        B = np.asarray(B)
+        if B.shape[0] != self.n:
+            raise ValueError(f"Right-hand side must have {self.n} rows, got {B.shape[0]}")
+        return lu_solve(self.lu, self.perm, B)
+
+
 def main():
     m1=LU(np.array([[25,5,1],[64,8,1],[144,12,1]],dtype=float),np.array([1,2,3],dtype=float))
     print(m1.getfinal())
-main()  
\ No newline at end of file
+
+    factorization = LUFactorization(np.array([[25,5,1],[64,8,1],[144,12,1]],dtype=float))
+    print(factorization.solve(np.array([[1,4],[2,5],[3,6]],dtype=float)))
+
+
+if __name__ == "__main__":
+    main()  
\ No newline at end of file
@@ -0,0 +1,149 @@
+import numpy as np
+
+# Band storage follows LAPACK: for lower bandwidth kl and upper bandwidth ku,
+# ab has shape (kl + ku + 1, n) and ab[ku + i - j, j] = A[i, j].
+# A tridiagonal matrix can also be given as its three diagonals.
+
+
+def detect_bandwidth(A):
+    """Lower and upper bandwidth ``(kl, ku)`` of a dense matrix."""
+    A = np.asarray(A)
+    mask = A != 0
+    rows = np.flatnonzero(mask.any(axis=1))
+    if len(rows) == 0:
+        return 0, 0
+    n = A.shape[1]
+    first = np.argmax(mask[rows], axis=1)
+    last = n - 1 - np.argmax(mask[rows, ::-1], axis=1)
+    return int(max(0, np.max(rows - first))), int(max(0, np.max(last - rows)))
+
+
+def is_narrow_band(A, kl, ku):
+    """Whether band storage pays off over dense elimination."""
+    n = A.shape[0] if hasattr(A, 'shape') else len(A)
+    return n >= 64 and kl + ku + 1 <= n // 4
+
+
+def dense_to_banded(A, kl, ku):
+    A = np.asarray(A, dtype=float)
+    n = A.shape[1]
+    ab = np.zeros((kl + ku + 1, n))
+    for offset in range(-kl, ku + 1):
+        diagonal = np.diagonal(A, offset)
+        if offset >= 0:
+            ab[ku - offset, offset:] = diagonal
+        else:
+            ab[ku - offset, :n + offset] = diagonal
+    return ab
+
+
+def thomas(lower, diag, upper, d):
+    """Thomas algorithm for a tridiagonal system, O(n) time and memory, without pivoting.
+
+    ``lower`` and ``upper`` are the n-1 sub- and super-diagonal entries; ``d``
+    is a vector or an (n, m) matrix of right-hand sides.
+    """
+    b = np.array(diag, dtype=float)
+    x = np.array(d, dtype=float)
+    n = len(b)
+
+    for i in range(1, n):
+        if b[i - 1] == 0:
+            raise ValueError(f"Zero pivot encountered at row {i - 1}. Use banded LU with pivoting.")
+        w = lower[i - 1] / b[i - 1]
+        b[i] -= w * upper[i - 1]
+        x[i] -= w * x[i - 1]
+
+    if b[n - 1] == 0:
+        raise ValueError(f"Zero pivot encountered at row {n - 1}. Use banded LU with pivoting.")
+    x[n - 1] /= b[n - 1]
+    for i in reversed(range(n - 1)):
+        x[i] = (x[i] - upper[i] * x[i + 1]) / b[i]
+    return x
+
+
+def band_view(work, kl):
+    """Dense-indexed view ``V[i, j]`` of row-wise band storage ``work[i, j - i + kl]``.
+
+    Only entries with -kl <= j - i <= kl + ku may be touched: outside the
+    band the view aliases neighbouring rows.
+    """
+    n, w = work.shape
+    flat = work.reshape(-1)
+    return np.lib.stride_tricks.as_strided(
+        flat[kl:], shape=(n, n), strides=((w - 1) * flat.itemsize, flat.itemsize), writeable=True)
+
+
+def banded_lu_factor(ab, kl, ku):
+    """Banded LU with partial pivoting inside the band.
+
+    Row swaps widen U to ``kl + ku`` superdiagonals, so row i of the factor
+    is kept in ``work[i]`` covering columns i - kl .. i + kl + ku. Returns
+    ``(work, piv)``; row k was swapped with row ``piv[k]``.
+    """
+    n = ab.shape[1]
+    work = np.zeros((n, 2 * kl + ku + 1))
+    for offset in range(-kl, ku + 1):
+        rows = np.arange(max(0, -offset), min(n, n - offset))
+        work[rows, offset + kl] = ab[ku - offset, rows + offset]
+    V = band_view(work, kl)
+    piv = np.arange(n)
+
+    for k in range(n):
+        m = min(kl, n - 1 - k)
+        last = min(n, k + kl + ku + 1)
+        p = k + np.abs(V[k:k + m + 1, k]).argmax()
+        if V[p, k] == 0:
+            raise ValueError(f"Zero pivot encountered at row {k}. Matrix is singular.")
+        if p != k:
+            piv[k] = p
+            row_k = V[k, k:last].copy()
+            V[k, k:last] = V[p, k:last]
+            V[p, k:last] = row_k
+
+        V[k + 1:k + m + 1, k] /= V[k, k]
+        V[k + 1:k + m + 1, k + 1:last] -= np.multiply.outer(V[k + 1:k + m + 1, k], V[k, k + 1:last])
+
+    return work, piv
+
+
+def banded_lu_solve(work, piv, kl, ku, b):
+    n = len(work)
+    V = band_view(work, kl)
+    x = np.array(b, dtype=float)
+
+    for k in range(n):
+        m = min(kl, n - 1 - k)
+        if piv[k] != k:
+            x[[k, piv[k]]] = x[[piv[k], k]]
+        if m:
+            x[k + 1:k + m + 1] -= np.multiply.outer(V[k + 1:k + m + 1, k], x[k])
+
+    for k in reversed(range(n)):
+        last = min(n, k + kl + ku + 1)
+        x[k] = (x[k] - V[k, k + 1:last] @ x[k + 1:last]) / V[k, k]
+    return x
+
+
+def solve_banded(ab, kl, ku, b):
+    """Solve a system given in band storage.
+
+    Diagonally dominant tridiagonal systems use the Thomas algorithm; anything
+    else uses banded LU with partial pivoting.
+    """
+    if kl == 1 and ku == 1 and diagonally_dominant(ab, kl, ku):
+        return thomas(ab[2, :-1], ab[1], ab[0, 1:], b)
+    work, piv = banded_lu_factor(np.asarray(ab, dtype=float), kl, ku)
+    return banded_lu_solve(work, piv, kl, ku, b)
+
+
+def diagonally_dominant(ab, kl, ku):
+    magnitudes = np.abs(ab)
+    return bool(np.all(2 * magnitudes[ku] >= magnitudes.sum(axis=0)))
+
+
+def solve_dense_banded(A, b, kl=None, ku=None):
+    """Solve a dense matrix through band storage, detecting the bandwidth if not given."""
+    if kl is None or ku is None:
+        kl, ku = detect_bandwidth(A)
+    return solve_banded(dense_to_banded(A, kl, ku), kl, ku, b)
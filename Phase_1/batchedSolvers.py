@@ -0,0 +1,154 @@
+import numpy as np
+
+# Batched versions of the Gauss, LU and Cholesky paths for stacks of small
+# systems: A has shape (k, n, n), B has shape (k, n) or (k, n, m). Every step
+# of the elimination runs over the whole batch at once. A singular (or, for
+# Cholesky, non positive definite) item is flagged in the returned mask and
+# gets NaN solutions; the rest of the batch is unaffected.
+
+
+def as_batch(A, B):
+    A = np.array(A, dtype=float)
+    if A.ndim != 3 or A.shape[1] != A.shape[2]:
+        raise ValueError("A must have shape (k, n, n)")
+    B = np.asarray(B, dtype=float)
+    vector = B.ndim == 2
+    if B.shape[:2] != A.shape[:2] or B.ndim not in (2, 3):
+        raise ValueError("B must have shape (k, n) or (k, n, m)")
+    return A, (B[..., None] if vector else B).copy(), vector
+
+
+def swap_rows(M, j, p):
+    items = np.arange(len(M))
+    row = M[items, j].copy()
+    M[items, j] = M[items, p]
+    M[items, p] = row
+
+
+def finish(X, singular, vector):
+    X[singular] = np.nan
+    return (X[..., 0] if vector else X), singular
+
+
+def batched_lu_factor(A, tol=1e-12):
+    """Packed LU with partial pivoting per item: ``A[i][perm[i]] = L_i U_i``.
+
+    Returns ``(lu, perm, singular)``.
+    """
+    lu = np.array(A, dtype=float)
+    k, n, _ = lu.shape
+    perm = np.tile(np.arange(n), (k, 1))
+    singular = np.zeros(k, dtype=bool)
+    scale = np.max(np.abs(lu), axis=(1, 2)) if n else np.zeros(k)
+
+    for j in range(n):
+        p = j + np.argmax(np.abs(lu[:, j:, j]), axis=1)
+        swap_rows(lu, j, p)
+        swap_rows(perm, j, p)
+        pivot = lu[:, j, j]
+        bad = np.abs(pivot) <= tol * scale
+        singular |= bad
+        # keep eliminating singular items with a dummy pivot; their result is discarded
+        pivot = np.where(bad, 1.0, pivot)
+        lu[:, j + 1:, j] /= pivot[:, None]
+        lu[:, j + 1:, j + 1:] -= lu[:, j + 1:, j, None] * lu[:, j, None, j + 1:]
+
+    return lu, perm, singular
+
+
+def batched_lu_solve(lu, perm, B, singular=None):
+    n = lu.shape[1]
+    B = np.asarray(B, dtype=float)
+    vector = B.ndim == 2
+    X = np.take_along_axis(B[..., None] if vector else B, perm[..., None], axis=1)
+
+    diag = np.diagonal(lu, axis1=1, axis2=2).copy()
+    if singular is not None:
+        diag[singular] = 1.0
+    for i in range(1, n):
+        X[:, i] -= (lu[:, i, None, :i] @ X[:, :i])[:, 0]
+    for i in reversed(range(n)):
+        X[:, i] = (X[:, i] - (lu[:, i, None, i + 1:] @ X[:, i + 1:])[:, 0]) / diag[:, i, None]
+
+    if singular is None:
+        return X[..., 0] if vector else X
+    return finish(X, singular, vector)
+
+
+def batched_lu(A, B, tol=1e-12):
+    """Solve every system of the batch by LU; returns ``(X, singular)``."""
+    A, _, _ = as_batch(A, B)
+    lu, perm, singular = batched_lu_factor(A, tol)
+    return batched_lu_solve(lu, perm, B, singular)
+
+
+def batched_gauss(A, B, use_scaling=False, tol=1e-12):
+    """Gaussian elimination with (scaled) partial pivoting on every item; returns ``(X, singular)``."""
+    A, X, vector = as_batch(A, B)
+    k, n, _ = A.shape
+    singular = np.zeros(k, dtype=bool)
+    scale = np.max(np.abs(A), axis=(1, 2)) if n else np.zeros(k)
+    row_scale = np.max(np.abs(A), axis=2)
+    row_scale[row_scale == 0] = 1.0
+
+    for j in range(n):
+        column = np.abs(A[:, j:, j])
+        if use_scaling:
+            column = column / row_scale[:, j:]
+        p = j + np.argmax(column, axis=1)
+        swap_rows(A, j, p)
+        swap_rows(X, j, p)
+        swap_rows(row_scale, j, p)
+        pivot = A[:, j, j]
+        bad = np.abs(pivot) <= tol * scale
+        singular |= bad
+        pivot = np.where(bad, 1.0, pivot)
+        factors = A[:, j + 1:, j] / pivot[:, None]
+        A[:, j + 1:, j + 1:] -= factors[:, :, None] * A[:, j, None, j + 1:]
+        X[:, j + 1:] -= factors[:, :, None] * X[:, j, None]
+
+    diag = np.diagonal(A, axis1=1, axis2=2).copy()
+    diag[singular] = 1.0
+    for i in reversed(range(n)):
+        X[:, i] = (X[:, i] - (A[:, i, None, i + 1:] @ X[:, i + 1:])[:, 0]) / diag[:, i, None]
+    return finish(X, singular, vector)
+
+
+def batched_cholesky(A):
+    """Cholesky of every item; returns ``(L, not_positive_definite)``. Only the lower triangles are read."""
+    A = np.asarray(A, dtype=float)
+    k, n, _ = A.shape
+    L = np.zeros_like(A)
+    failed = np.zeros(k, dtype=bool)
+
+    for j in range(n):
+        pivot = A[:, j, j] - np.einsum('ki,ki->k', L[:, j, :j], L[:, j, :j])
+        bad = pivot <= 0
+        failed |= bad
+        L[:, j, j] = np.sqrt(np.where(bad, 1.0, pivot))
+        L[:, j + 1:, j] = (A[:, j + 1:, j] - (L[:, j + 1:, :j] @ L[:, j, :j, None])[..., 0]) / L[:, j, j, None]
+
+    return L, failed
+
+
+def batched_cholesky_solve(L, B, failed=None):
+    n = L.shape[1]
+    B = np.asarray(B, dtype=float)
+    vector = B.ndim == 2
+    X = (B[..., None] if vector else B).copy()
+
+    for i in range(n):
+        X[:, i] = (X[:, i] - (L[:, i, None, :i] @ X[:, :i])[:, 0]) / L[:, i, i, None]
+    for i in reversed(range(n)):
+        X[:, i] = (X[:, i] - (L[:, i + 1:, i, None].transpose(0, 2, 1) @ X[:, i + 1:])[:, 0]) / L[:, i, i, None]
+
+    if failed is None:
+        return X[..., 0] if vector else X
+    return finish(X, failed, vector)
+
+
+def batched_cholesky_system(A, B):
+    """Solve every symmetric positive definite system by Cholesky; returns ``(X, not_positive_definite)``."""
+    A, _, _ = as_batch(A, B)
+    L, failed = batched_cholesky(A)
+    return batched_cholesky_solve(L, B, failed)
@@ -1,5 +1,7 @@
 import numpy as np
 
+from factorizationCache import get_cache
+
 
 def cholesky_decomposition(A):
     A = np.array(A, dtype=float)
@@ -11,21 +13,63 @@ def cholesky_decomposition(A):
     if not np.allclose(A, A.T):
         raise ValueError("Matrix must be symmetric")
 
-    if not np.all(np.linalg.eigvals(A) >= 0):
-        raise ValueError("Matrix must be positive definite")
+    # positive definiteness is checked by the factorization itself (non-positive pivot)
+    L = blocked_cholesky(A, overwrite_a=True)
 
-    L = np.zeros_like(A)
+    return L, L.T
 
-    for i in range(n):
-        for j in range(i + 1):
-            if i == j:
-                sum = np.dot(L[i, :i], L[i, :i])  # sum of pow(L[i, j], 2)
-                L[i, i] = np.sqrt(A[i, i] - sum)
-            else:
-                sum = np.dot(L[i, :j], L[j, :j])  # sum of L[i, j] * L[j, j]
-                L[i, j] = (A[i, j] - sum) / L[j, j]
 
-    return L, L.T
+def blocked_cholesky(A, block_size=64, overwrite_a=False, dtype=np.float64):
+    """Right-looking blocked Cholesky that reads only the lower triangle of A.
+
+    Each column panel is factored with one matrix-vector product per column.
+    The trailing lower triangle is then updated with matrix products, one
+    block column at a time. Returns L, computed in ``dtype``, with zeros
+    above the diagonal. With ``overwrite_a`` that is ``A`` itself, so the
+    upper triangle of A is overwritten too. Raises ValueError on a
+    non-positive pivot.
+    """
+    if not (overwrite_a and isinstance(A, np.ndarray) and A.dtype == dtype):
+        A = np.array(A, dtype=dtype)
+    n = len(A)
+
+    for k in range(0, n, block_size):
+        e = min(k + block_size, n)
+        for j in range(k, e):
+            pivot = A[j, j] - A[j, k:j] @ A[j, k:j]
+            if pivot <= 0:
+                raise ValueError("Matrix must be positive definite")
+            A[j, j] = np.sqrt(pivot)
+            A[j + 1:, j] = (A[j + 1:, j] - A[j + 1:, k:j] @ A[j, k:j]) / A[j, j]
+
+        panel = A[e:, k:e]
+        for c in range(e, n, block_size):
+            d = min(c + block_size, n)
+            A[c:, c:d] -= panel[c - e:] @ panel[c - e:d - e].T
+
+    for i in range(n - 1):
+        A[i, i + 1:] = 0
+    return A
+
+
+def cholesky_update(L, x, sign=1):
+    """Rank-one update (``sign=1``) or downdate (``sign=-1``) of a lower factor in O(n^2).
+
+    On return ``L L^T`` equals the old ``L L^T + sign * x x^T``; L is modified
+    in place. Raises ValueError if a downdate leaves the matrix indefinite.
+    """
+    x = np.array(x, dtype=float)
+    for k in range(len(L)):
+        square = L[k, k] ** 2 + sign * x[k] ** 2
+        if square <= 0:
+            raise ValueError("Matrix must be positive definite")
+        r = np.sqrt(square)
+        c = r / L[k, k]
+        s = x[k] / L[k, k]
+        L[k, k] = r
+        L[k + 1:, k] = (L[k + 1:, k] + sign * s * x[k + 1:]) / c
+        x[k + 1:] = c * x[k + 1:] - s * L[k + 1:, k]
+    return L
 
 
 def forward_substitution(L, b):
@@ -44,8 +88,22 @@ def backward_substitution(U, y):
     return x
 
 
-def solve_system(A, b):
-    L, U = cholesky_decomposition(A)
+def cholesky_solve(L, B):
+    """Solve ``L L^T X = B`` for ``(n,)`` or ``(n, m)`` right-hand sides in the precision of L."""
+    X = np.array(B, dtype=L.dtype)
+    n = len(L)
+    for i in range(n):
+        X[i] = (X[i] - L[i, :i] @ X[:i]) / L[i, i]
+    for i in reversed(range(n)):
+        X[i] = (X[i] - L[i + 1:, i] @ X[i + 1:]) / L[i, i]
+    return X
+
+
+def solve_system(A, b, use_cache=True):
+    if use_cache:
+        L, U = get_cache().get_or_factor(A, 'cholesky', cholesky_decomposition)
+    else:
+        L, U = cholesky_decomposition(A)
     y = forward_substitution(L, b)
     x = backward_substitution(U, y)
     return x
@@ -1,7 +1,16 @@
 import numpy as np
 
-def lu_decomposition_crout(A):
-    A = np.array(A, dtype=float)
+from factorizationCache import get_cache
+
+
+def lu_decomposition_crout(A, L=None, U=None):
+    """Crout LU (unit diagonal in U), one column of L and one row of U per step.
+
+    Each step is two matrix-vector products written into a reused work
+    vector. ``L`` and ``U`` may be caller-provided float arrays of A's
+    shape, which are filled in place.
+    """
+    A = np.asarray(A, dtype=float)
 
     if A.ndim != 2 or A.size == 0:
         raise ValueError("Input must be a non-empty 2D matrix")
@@ -12,20 +21,25 @@ def lu_decomposition_crout(A):
     if A.shape[1] != n:
         raise ValueError("Input matrix must be square")
 
-    L = np.zeros_like(A, dtype=float)
-    U = np.eye(n, dtype=float)
+    L = np.empty_like(A) if L is None else L
+    U = np.empty_like(A) if U is None else U
+    work = np.empty(n)
 
     for j in range(n):
-        # Compute column j in L
-        for i in range(j, n):
-            L[i, j] = A[i, j] - np.sum(L[i, :j] * U[:j, j])
+        # Compute column j in L: L[j:, j] = A[j:, j] - L[j:, :j] @ U[:j, j]
+        L[:j, j] = 0
+        np.dot(L[j:, :j], U[:j, j], out=work[:n - j])
+        np.subtract(A[j:, j], work[:n - j], out=L[j:, j])
 
         if np.isclose(L[j, j], 0):
             raise ValueError("Matrix is singular and cannot be decomposed using LU decomposition")
 
-        # Compute row j in U
-        for i in range(j + 1, n):
-            U[j, i] = (A[j, i] - np.sum(L[j, :j] * U[:j, i])) / L[j, j]
+        # Compute row j in U: U[j, j+1:] = (A[j, j+1:] - L[j, :j] @ U[:j, j+1:]) / L[j, j]
+        U[j, :j] = 0
+        U[j, j] = 1
+        np.dot(L[j, :j], U[:j, j + 1:], out=work[:n - j - 1])
+        np.subtract(A[j, j + 1:], work[:n - j - 1], out=U[j, j + 1:])
+        U[j, j + 1:] /= L[j, j]
 
     return L, U
 
@@ -44,8 +58,11 @@ def backward_substitution(U, y):
         x[i] = (y[i] - np.sum(U[i, i+1:] * x[i+1:])) / U[i, i]
     return x
 
-def solve_system(A, b):
-    L, U = lu_decomposition_crout(A)
+def solve_system(A, b, use_cache=True):
+    if use_cache:
+        L, U = get_cache().get_or_factor(A, 'crout', lu_decomposition_crout)
+    else:
+        L, U = lu_decomposition_crout(A)
     y = forward_substitution(L, b)
     x = backward_substitution(U, y)
     return x
@@ -0,0 +1,196 @@
+import os
+import sys
+import time
+from collections import deque
+
+import numpy as np
+
+here = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(here, 'methods'))
+
+from LU.LU import LUFactorization, lu_solve
+from bandedSolvers import detect_bandwidth, is_narrow_band, solve_banded, solve_dense_banded
+from cholsekyDecomposition import blocked_cholesky, cholesky_solve
+from iterationMethods import ConjugateGradientSolver, ConvergenceError, GMRESSolver, GaussSeidelSolver
+from parallelSolvers import parallel_lu_factor
+from preconditioners import BreakdownError
+from sparseMatrix import CSRMatrix, is_sparse, as_matrix
+
+# dense matrices at most this full (and at least this large) are solved as sparse
+SPARSE_DENSITY = 0.05
+SPARSE_MIN_SIZE = 1000
+
+# iterative results with a larger relative residual are redone with dense LU up to this size
+# (n = 3000 densifies to 72 MB and factors in seconds with the tiled LU)
+RESIDUAL_LIMIT = 1e-6
+DENSE_FALLBACK_SIZE = 3000
+
+# general dense systems at least this large are factored with the tiled LU on a thread pool
+PARALLEL_MIN_SIZE = 512
+
+# the most recent reports, newest last
+reports = deque(maxlen=100)
+
+
+def inspect(A):
+    """Cheap structural properties of A used to pick a solver (all O(n^2) or O(nnz))."""
+    if isinstance(A, CSRMatrix):
+        n = A.shape[0]
+        diag = A.diagonal()
+        off_diag = np.bincount(A.row_ids, weights=np.abs(A.data), minlength=n) - np.abs(diag)
+        order = np.lexsort((A.indices, A.row_ids))
+        T = A.transpose()
+        t_order = np.lexsort((T.indices, T.row_ids))
+        symmetric = (A.nnz == T.nnz
+                     and np.array_equal(A.indices[order], T.indices[t_order])
+                     and np.array_equal(A.row_ids[order], T.row_ids[t_order])
+                     and np.allclose(A.data[order], T.data[t_order]))
+        return {
+            'n': n,
+            'sparse': True,
+            'density': A.nnz / (n * n),
+            'bandwidth': A.bandwidth(),
+            'symmetric': bool(symmetric),
+            'positive_diagonal': bool(np.all(diag > 0)),
+            'diagonally_dominant': bool(np.all(np.abs(diag) >= off_diag)),
+        }
+
+    n = len(A)
+    diag = np.diag(A)
+    off_diag = np.abs(A).sum(axis=1) - np.abs(diag)
+    return {
+        'n': n,
+        'sparse': False,
+        'density': np.count_nonzero(A) / (n * n) if n else 1.0,
+        'bandwidth': detect_bandwidth(A),
+        'symmetric': bool(np.allclose(A, A.T)),
+        'positive_diagonal': bool(np.all(diag > 0)),
+        'diagonally_dominant': bool(np.all(np.abs(diag) >= off_diag)),
+    }
+
+
+def relative_residual(A, b, x):
+    b = np.asarray(b, dtype=float)
+    if b.ndim == 2:
+        return max(relative_residual(A, column, x[:, j]) for j, column in enumerate(b.T))
+    return np.linalg.norm(b - A @ x) / (np.linalg.norm(b) or 1.0)
+
+
+def solve_iteratively(A, b, properties, reasons, tol):
+    if np.ndim(b) == 2:
+        # the iterative engines take one right-hand side at a time
+        methods, columns = [], []
+        for column in np.asarray(b, dtype=float).T:
+            column_reasons = []
+            method, x = solve_iteratively(A, column, properties, column_reasons, tol)
+            reasons.extend(reason for reason in column_reasons if reason not in reasons)
+            methods.append(method)
+            columns.append(x)
+        return '+'.join(dict.fromkeys(methods)), np.column_stack(columns)
+
+    if properties['symmetric'] and properties['positive_diagonal']:
+        try:
+            # Jacobi scaling costs one vector product per iteration; IC(0) needs fewer
+            # iterations, but its Python setup and level-by-level solves cost more than that saves
+            solver = ConjugateGradientSolver(A, b, preconditioner='jacobi')
+            x = solver.solve_by_error(tol, max_iterations=max(100, 2 * properties['n']))
+            reasons.append("symmetric with positive diagonal: conjugate gradients with Jacobi preconditioning")
+            return 'cg', x
+        except ConvergenceError:
+            reasons.append("conjugate gradients did not converge: A is not positive definite or too ill-conditioned")
+    if properties['diagonally_dominant']:
+        solver = GaussSeidelSolver(A, b)
+        x = solver.solve_by_error(tol, max_iterations=max(100, 2 * properties['n']), precheck=True,
+                                  fallback=GMRESSolver)
+        if getattr(solver, 'fallback_solver', None) is None:
+            reasons.append("diagonally dominant: Gauss-Seidel converges")
+            return 'gauss-seidel', x
+        reasons.append("diagonally dominant but Gauss-Seidel predicted too slow: GMRES")
+        return 'gmres', x
+    try:
+        solver = GMRESSolver(A, b, preconditioner='ilu0')
+        reasons.append("neither positive definite nor dominant: GMRES with ILU(0)")
+    except BreakdownError:
+        solver = GMRESSolver(A, b)
+        reasons.append("neither positive definite nor dominant, ILU(0) broke down: GMRES")
+    # without breakdown, full GMRES finishes within n steps: allow twice that many restart cycles' worth
+    return 'gmres', solver.solve_by_error(tol, max_iterations=max(10, 2 * properties['n'] // solver.restart))
+
+
+def dense_lu_solve(A, b):
+    if len(A) >= PARALLEL_MIN_SIZE:
+        return lu_solve(*parallel_lu_factor(A), b)
+    return LUFactorization(A).solve(b)
+
+
+def solve_direct(A, b, properties, reasons):
+    if properties['symmetric'] and properties['positive_diagonal']:
+        try:
+            L = blocked_cholesky(A)
+        except ValueError:
+            reasons.append("symmetric but not positive definite: Cholesky failed")
+        else:
+            reasons.append("symmetric positive definite: blocked Cholesky")
+            return 'cholesky', cholesky_solve(L, b)
+
+    if properties['n'] >= PARALLEL_MIN_SIZE:
+        reasons.append("large general matrix: tiled LU with partial pivoting on a thread pool")
+    else:
+        reasons.append("general matrix: LU with partial pivoting")
+    return 'lu', dense_lu_solve(A, b)
+
+
+def solve(A, b, tol=1e-10, report=False):
+    """Solve ``A x = b`` with the engine that fits the structure of A.
+
+    Narrow-band input, dense or sparse, goes to the banded solver. Other
+    sparse input, and large dense input that is mostly zeros, goes to an
+    iterative method (CG, Gauss-Seidel or GMRES by symmetry and dominance).
+    Other dense input goes to Cholesky or pivoted LU. The
+    chosen method, the reasons and the timings are appended to ``reports``
+    and returned as well when ``report`` is true.
+    """
+    start = time.perf_counter()
+    A = as_matrix(A)
+    if not is_sparse(A) and (A.ndim != 2 or A.shape[0] != A.shape[1]):
+        raise ValueError("Matrix must be square")
+    properties = inspect(A)
+    inspected = time.perf_counter()
+
+    reasons = []
+    kl, ku = properties['bandwidth']
+    if is_narrow_band(A, kl, ku):
+        reasons.append(f"band structure (kl={kl}, ku={ku}): banded solver")
+        if properties['sparse']:
+            method, x = 'banded', solve_banded(A.to_banded(kl, ku), kl, ku, b)
+        else:
+            method, x = 'banded', solve_dense_banded(A, b, kl, ku)
+    elif properties['sparse'] or (properties['n'] >= SPARSE_MIN_SIZE and properties['density'] <= SPARSE_DENSITY
+                                and np.ndim(b) == 1):
+        if not properties['sparse']:
+            reasons.append(f"density {properties['density']:.2%}: stored as CSR")
+            A = CSRMatrix.from_dense(A)
+        try:
+            method, x = solve_iteratively(A, b, properties, reasons, tol)
+        except (ConvergenceError, BreakdownError) as error:
+            if properties['n'] > DENSE_FALLBACK_SIZE:
+                raise
+            reasons.append(f"iterative solve failed ({error}): dense LU")
+            method, x = 'lu', dense_lu_solve(A.toarray(), b)
+        else:
+            residual = relative_residual(A, b, x)
+            if residual > RESIDUAL_LIMIT and properties['n'] <= DENSE_FALLBACK_SIZE:
+                reasons.append(f"{method} stagnated at relative residual {residual:.2g}: dense LU")
+                method, x = 'lu', dense_lu_solve(A.toarray(), b)
+    else:
+        method, x = solve_direct(A, b, properties, reasons)
+    solved = time.perf_counter()
+
+    details = {
+        'method': method,
+        'reasons': reasons,
+        'properties': properties,
+        'timings': {'inspect': inspected - start, 'solve': solved - inspected, 'total': solved - start},
+    }
+    reports.append(details)
+    return (x, details) if report else x
@@ -0,0 +1,87 @@
+import math
+from fractions import Fraction
+
+import numpy as np
+
+# Exact solves of integer and rational systems with Bareiss fraction-free
+# elimination. Every entry stays a Python int, and each division is exact:
+# after step k an entry is a (k+1)x(k+1) minor of the input, so its size
+# grows linearly with k rather than exponentially as with Fraction entries.
+# One pass gives both the exact ranks of A and [A|b] and the solution.
+
+
+def integer_rows(A, b):
+    """``[A|b]`` as lists of Python ints, each row scaled by the lcm of its denominators."""
+    A = np.asarray(A, dtype=object)
+    b = np.asarray(b, dtype=object).reshape(len(A), -1)
+    rows = []
+    for row in np.hstack((A, b)):
+        row = [Fraction(value) for value in row]
+        scale = math.lcm(*(value.denominator for value in row))
+        rows.append([int(value * scale) for value in row])
+    return rows, A.shape[1]
+
+
+def bareiss(M, ncols):
+    """Fraction-free row echelon form of M in place, pivoting on the first ``ncols`` columns.
+
+    Returns the pivot columns; ``len`` of the result is the exact rank of
+    ``M[:, :ncols]``. A column with no nonzero entry left is skipped.
+    """
+    previous = 1
+    pivots = []
+    r = 0
+    for c in range(ncols):
+        if r == len(M):
+            break
+        p = next((i for i in range(r, len(M)) if M[i][c] != 0), None)
+        if p is None:
+            continue
+        M[r], M[p] = M[p], M[r]
+        pivot_row = M[r]
+        pivot = pivot_row[c]
+        for i in range(r + 1, len(M)):
+            row = M[i]
+            factor = row[c]
+            for j in range(c + 1, len(row)):
+                row[j] = (pivot * row[j] - factor * pivot_row[j]) // previous
+            row[c] = 0
+        previous = pivot
+        pivots.append(c)
+        r += 1
+    return pivots
+
+
+def exact_ranks(A, b):
+    """Exact ``(rank_A, rank_Aug)`` of an integer or rational system."""
+    M, n = integer_rows(A, b)
+    rank = len(bareiss(M, n))
+    inconsistent = any(value != 0 for row in M[rank:] for value in row[n:])
+    return rank, rank + int(inconsistent)
+
+
+def exact_solve(A, b):
+    """Solve ``A x = b`` exactly; returns an object array of Fractions.
+
+    Raises ValueError if the system has no solution or infinitely many.
+    """
+    M, n = integer_rows(A, b)
+    pivots = bareiss(M, n)
+    rank = len(pivots)
+    if any(value != 0 for row in M[rank:] for value in row[n:]):
+        raise ValueError(f"Inconsistent system: No solution at row {rank}.")
+    if rank < n:
+        raise ValueError("Infinite number of solutions: the matrix is singular.")
+
+    # The last pivot is +-det(A), so y = det * x is integral (Cramer's rule) and
+    # back substitution on y needs exact integer divisions only.
+    det = M[n - 1][n - 1]
+    m = len(M[0]) - n
+    y = [[0] * m for _ in range(n)]
+    for i in reversed(range(n)):
+        row = M[i]
+        for k in range(m):
+            total = det * row[n + k] - sum(row[j] * y[j][k] for j in range(i + 1, n))
+            y[i][k] = total // row[i]
+    x = np.array([[Fraction(value, det) for value in row] for row in y], dtype=object)
+    return x[:, 0] if np.ndim(b) == 1 else x
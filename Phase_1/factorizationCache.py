@@ -0,0 +1,116 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+def matrix_digest(A):
+    """Content hash of a matrix, including its shape."""
+    A = np.ascontiguousarray(A, dtype=float)
+    digest = hashlib.blake2b(A.tobytes(), digest_size=16)
+    digest.update(repr(A.shape).encode())
+    return digest.hexdigest()
+
+
+def nbytes(value, seen=None):
+    """Memory held by the arrays of a factorization; views are counted with their base."""
+    seen = set() if seen is None else seen
+    if isinstance(value, np.ndarray):
+        owner = value if value.base is None else value.base
+        if id(owner) in seen:
+            return 0
+        seen.add(id(owner))
+        return owner.nbytes
+    if isinstance(value, (tuple, list)):
+        return sum(nbytes(item, seen) for item in value)
+    if hasattr(value, '__dict__'):
+        return sum(nbytes(item, seen) for item in vars(value).values())
+    return 0
+
+
+def freeze(value):
+    """Make the arrays of a cached factorization read-only so callers cannot corrupt it."""
+    if isinstance(value, np.ndarray):
+        value.flags.writeable = False
+    elif isinstance(value, (tuple, list)):
+        for item in value:
+            freeze(item)
+    elif hasattr(value, '__dict__'):
+        for item in vars(value).values():
+            freeze(item)
+    return value
+
+
+class FactorizationCache:
+    """Process-wide LRU cache of factorizations keyed by (method, content hash of A)."""
+
+    def __init__(self, max_entries=32, max_bytes=256 * 2 ** 20):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    def configure(self, max_entries=None, max_bytes=None):
+        with self.lock:
+            if max_entries is not None:
+                self.max_entries = max_entries
+            if max_bytes is not None:
+                self.max_bytes = max_bytes
+            self.evict()
+
+    def evict(self):
+        while self.entries and (len(self.entries) > self.max_entries or self.bytes > self.max_bytes):
+            _, (_, size) = self.entries.popitem(last=False)
+            self.bytes -= size
+            self.evictions += 1
+
+    def get_or_factor(self, A, method, factor):
+        """Return the cached factorization of ``A`` for ``method``, calling ``factor(A)`` on a miss."""
+        key = (method, matrix_digest(A))
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key][0]
+            self.misses += 1
+
+        value = factor(A)
+        size = nbytes(value)
+        if size > self.max_bytes or self.max_entries <= 0:
+            return value
+
+        with self.lock:
+            if key not in self.entries:
+                self.entries[key] = (freeze(value), size)
+                self.bytes += size
+                self.evict()
+        return value
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.bytes = 0
+
+    def stats(self):
+        with self.lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self.entries),
+                'bytes': self.bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+            }
+
+
+default_cache = FactorizationCache()
+
+
+def get_cache():
+    return default_cache
@@ -1,25 +1,27 @@
 import copy
+import os
+import sys
+
 import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pivoting import Pivoter
+
 class forward_eliminator:
     def __init__(self,array,scalers):
         self.array=array
-        self.scalers=scalers
+        # scaled partial pivoting; the scale factors are swapped along with the rows
+        self.pivoter=Pivoter(array,'scaled',ncols=len(array),scales=scalers)
+        self.scalers=self.pivoter.scales
         self.tol=1e-9
         self.factors=[]
+        # cursor of Forward_Elimination_nextStep: current pivot column and next row to eliminate
+        self.step_pivot=0
+        self.step_row=None
     def pivoting(self, row):
-        index = row
-        flag=False
-        max_ratio = abs(self.array[row][row] / self.scalers[row])
-        for i in range(row+1,len(self.array)):
-            current_ratio = abs(self.array[i][row] / self.scalers[i])
-            if current_ratio > max_ratio:
-                max_ratio = current_ratio
-                index = i
-        if index != row:
-            self.array[[row, index]] = self.array[[index, row]]
-            self.scalers[row], self.scalers[index] = self.scalers[index], self.scalers[row]
-            flag=True
-        return self.array,flag
+        index, _ = self.pivoter.find(row)
+        self.pivoter.swap_rows(row, index)
+        return self.array, index != row
     def Forward_Elimination(self):
         arr = self.array    
         rows = len(arr)
@@ -40,28 +42,26 @@ class forward_eliminator:
         self.array = arr
         return factor
     def Forward_Elimination_nextStep(self):
-        flag = True 
+        """Do the next row swap or row elimination, resuming where the previous call stopped."""
         arr = self.array
         rows = len(arr)
-        cols = len(arr[0])
-        for i in range(rows):
-            arr,bool=self.pivoting(i)
-            if abs(arr[i][i] / self.scalers[i]) < self.tol:
-                    return -1   
-            if bool==True:
-                return False,arr
-            if any(arr[j][i] != 0 for j in range(i + 1, rows)):
-                flag = False
-                 
-                for j in range(i + 1, rows):
-               
-                    if arr[j][i] != 0: 
-                        factor = arr[j][i] / arr[i][i]
-                        for k in range(i, cols):
-                            arr[j][k] =arr[j][k]- (factor * arr[i][k])   
-                        return flag,arr
-        if abs(arr[rows - 1][rows - 1] / self.scalers[rows - 1]) < self.tol:
-            return -1        
-        return flag,arr
-
-
+        while self.step_pivot < rows:
+            i = self.step_pivot
+            if self.step_row is None:
+                arr, swapped = self.pivoting(i)
+                if abs(arr[i][i] / self.scalers[i]) < self.tol:
+                    return -1
+                self.step_row = i + 1
+                if swapped:
+                    return False, arr
+            nonzero = np.flatnonzero(arr[self.step_row:, i])
+            if len(nonzero):
+                j = self.step_row + nonzero[0]
+                factor = arr[j][i] / arr[i][i]
+                arr[j, i + 1:] -= factor * arr[i, i + 1:]
+                arr[j, i] = 0
+                self.step_row = j + 1
+                return False, arr
+            self.step_pivot += 1
+            self.step_row = None
+        return True, arr
@@ -1,8 +1,17 @@
+import os
+import sys
+
 import numpy as np
 import Forward_elimination
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import systemType
+from pivoting import scale_factors
+
 class gauss:
-    def __init__(self, n, b):
+    def __init__(self, n, b, exact=False):
+        # exact: classify integer or rational systems with fraction-free elimination
+        self.exact = exact
         self.array = np.zeros((len(n), len(n)+1))
         for i in range(len(n)):
             for j in range(len(n)):
@@ -17,24 +26,10 @@ class gauss:
         self.coefficient_matrix=n.copy()
         self.solution_type = self.detect_system_type()
        
-    def detect_system_type(self):
-        A = self.coefficient_matrix
-        Aug = np.column_stack((A, self.constant_vector))
-        rank_A = np.linalg.matrix_rank(A)
-        rank_Aug = np.linalg.matrix_rank(Aug)
-        n = A.shape[1]
-        
-        if rank_A == rank_Aug:
-            if rank_A == n:
-                self.solution_type = 'unique'
-                return 'unique'
-            else:
-                self.solution_type = 'infinite'
-                return 'infinite'
-
-        else:
-            self.solution_type = 'no solution'
-            return 'no solution'    
+    def detect_system_type(self, svd_fallback=False):
+        self.solution_type = systemType.classify_system(
+            self.coefficient_matrix, self.constant_vector, svd_fallback=svd_fallback, exact=self.exact)
+        return self.solution_type
 
     def gauss_elimination_generator(self):
         if(self.solution_type=='no solution'):
@@ -103,18 +98,7 @@ class gauss:
 
     def scaling(self):
         """Compute scaling factors for rows"""
-        arr = self.array
-        scalers = [0] * len(arr)
-        
-        for i in range(len(arr)):
-            max_val = abs(arr[i][0])
-            for j in range(1, len(arr)):
-                if abs(arr[i][j]) > max_val:
-                    max_val = abs(arr[i][j])
-            
-            scalers[i] = max_val
-        
-        return scalers
+        return scale_factors(self.array, ncols=len(self.array))
 
     def Backward_Substitution(self):
         """Perform backward substitution"""
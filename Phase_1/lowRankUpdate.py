@@ -0,0 +1,115 @@
+import numpy as np
+
+from LU.LU import LUFactorization
+from cholsekyDecomposition import blocked_cholesky, cholesky_solve, cholesky_update
+
+# Solving after small changes to A without refactoring. A stored
+# factorization of A0 is kept, and rank-k corrections A = A0 + U V^T are
+# applied to each solve by the Sherman-Morrison-Woodbury formula:
+#   A^-1 b = y - Z C^-1 V^T y,  y = A0^-1 b,  Z = A0^-1 U,  C = I + V^T Z.
+# An update costs O(k n^2) and a solve O(n^2 + n k). Once the accumulated
+# rank passes ``max_rank``, or C becomes ill-conditioned, A is refactored.
+
+
+class WoodburySolver:
+    """Solve ``A x = b`` across low-rank changes of A while reusing one factorization.
+
+    ``method`` is 'lu' or 'cholesky' (A symmetric positive definite). With
+    Cholesky, symmetric rank-one changes made through ``update_symmetric``
+    update the factor directly instead of adding a correction term.
+    ``refactorizations`` counts the full factorizations done so far.
+    """
+
+    def __init__(self, A, method='lu', max_rank=None, cond_limit=1e8):
+        if method not in ('lu', 'cholesky'):
+            raise ValueError(f"Unknown method {method!r}: expected 'lu' or 'cholesky'")
+        self.A = np.array(A, dtype=float)
+        if self.A.ndim != 2 or self.A.shape[0] != self.A.shape[1]:
+            raise ValueError("Matrix must be square")
+        self.n = len(self.A)
+        self.method = method
+        self.max_rank = max_rank if max_rank is not None else max(1, int(np.sqrt(self.n)))
+        self.cond_limit = cond_limit
+        self.refactorizations = 0
+        self.refactor()
+
+    @property
+    def rank(self):
+        """Rank of the correction currently applied on top of the factorization."""
+        return self.V.shape[1]
+
+    def refactor(self, A=None):
+        """Factor ``A`` (by default the current matrix) and make it current; nothing changes if that fails."""
+        A = self.A if A is None else A
+        if self.method == 'lu':
+            self.factorization = LUFactorization(A)
+        else:
+            self.L = blocked_cholesky(A)
+        self.A = A
+        self.Z = np.empty((self.n, 0))
+        self.V = np.empty((self.n, 0))
+        self.capacitance = np.empty((0, 0))
+        self.refactorizations += 1
+
+    def base_solve(self, B):
+        if self.method == 'lu':
+            return self.factorization.solve(B)
+        return cholesky_solve(self.L, B)
+
+    def update(self, U, V):
+        """Change A to ``A + U V^T`` for ``(n,)`` or ``(n, k)`` factors U and V."""
+        U = np.asarray(U, dtype=float).reshape(self.n, -1)
+        V = np.asarray(V, dtype=float).reshape(self.n, -1)
+        if U.shape != V.shape:
+            raise ValueError("U and V must have the same shape")
+        A = self.A + U @ V.T
+        if self.rank + U.shape[1] > self.max_rank:
+            self.refactor(A)
+            return
+
+        Z = np.column_stack([self.Z, self.base_solve(U)])
+        V = np.column_stack([self.V, V])
+        capacitance = np.eye(V.shape[1]) + V.T @ Z
+        if np.linalg.cond(capacitance) > self.cond_limit:
+            self.refactor(A)
+            return
+        self.A, self.Z, self.V, self.capacitance = A, Z, V, capacitance
+
+    def update_rows(self, rows, values):
+        """Replace the given rows of A with ``values`` (one row per index)."""
+        rows = np.atleast_1d(rows)
+        values = np.asarray(values, dtype=float).reshape(len(rows), self.n)
+        U = np.zeros((self.n, len(rows)))
+        U[rows, np.arange(len(rows))] = 1
+        self.update(U, (values - self.A[rows]).T)
+
+    def update_entries(self, rows, cols, values):
+        """Set ``A[rows[i], cols[i]] = values[i]``; each changed row adds one to the rank."""
+        rows, cols = np.atleast_1d(rows), np.atleast_1d(cols)
+        changed = np.unique(rows)
+        new_rows = self.A[changed].copy()
+        new_rows[np.searchsorted(changed, rows), cols] = values
+        self.update_rows(changed, new_rows)
+
+    def update_symmetric(self, x, sign=1):
+        """Change A to ``A + sign * x x^T``, through a direct factor update for Cholesky."""
+        x = np.asarray(x, dtype=float)
+        if self.method != 'cholesky' or self.rank:
+            self.update(sign * x, x)
+            return
+        A = self.A + sign * np.outer(x, x)
+        L = self.L.copy()
+        try:
+            cholesky_update(L, x, sign)
+        except ValueError:
+            # the copy may be half updated: rebuild from A, which also reports a truly indefinite A
+            self.refactor(A)
+            return
+        self.A, self.L = A, L
+
+    def solve(self, B):
+        """Solve with the current A for a vector ``(n,)`` or a matrix ``(n, m)`` of right-hand sides."""
+        Y = self.base_solve(B)
+        if not self.rank:
+            return Y
+        return Y - self.Z @ np.linalg.solve(self.capacitance, self.V.T @ Y)
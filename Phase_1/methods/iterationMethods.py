@@ -1,59 +1,377 @@
 import numpy as np
 
+from preconditioners import make_preconditioner
+from sparseMatrix import CSRMatrix, LinearOperator, as_matrix, greedy_coloring
+
+class ConvergenceError(ValueError):
+    """The iteration did not reach the requested error within its iteration budget."""
+
 class IterativeSolver:
+    # splitting methods divide by the diagonal, Krylov methods only need products with A
+    requires_diagonal = True
+    # splitting methods have a fixed iteration matrix whose spectral radius decides convergence
+    stationary = True
+
     def __init__(self, A, b, x0=None):
-        A = np.array(A, dtype=float)
+        # CSR input (CSRMatrix or scipy.sparse) stays sparse, anything else becomes dense
+        if callable(A) and not hasattr(A, 'shape'):
+            A = LinearOperator((len(b), len(b)), A)
+        A = as_matrix(A)
+        self.sparse = isinstance(A, CSRMatrix)
         
-        # Check for zero diagonal elements
-        for i in range(A.shape[0]):
-            if A[i, i] == 0:
-                raise RuntimeError(f"Zero diagonal element found at index {i}.")
+        if self.requires_diagonal:
+            if isinstance(A, LinearOperator):
+                raise ValueError(f"{type(self).__name__} needs an explicit matrix, not an operator.")
+            # Check for zero diagonal elements
+            self.diag = A.diagonal() if self.sparse else np.diag(A).copy()
+            zeros = np.flatnonzero(self.diag == 0)
+            if len(zeros):
+                raise RuntimeError(f"Zero diagonal element found at index {zeros[0]}.")
         
         self.A = A
         self.b = np.array(b, dtype=float)
         
         # Initial solution
         self.x = np.zeros_like(b, dtype=float) if x0 is None else np.array(x0, dtype=float)
+        # spare iterate buffer for methods that build the next iterate out of place
+        self.x_next = np.empty_like(self.x)
+        self.history = None
 
     def solve_by_iterations(self, num_iterations):
         for _ in range(num_iterations):
             self.nextStep()
-        return self.x
+        return self.x.copy()
+
+    def apply_iteration_matrix(self, v):
+        """G v for the iteration x <- G x + c, i.e. one sweep from v with b = 0."""
+        x, b = self.x, self.b
+        self.x, self.b = np.array(v, dtype=float), np.zeros_like(b)
+        try:
+            self.nextStep()
+            return self.x
+        finally:
+            self.x, self.b = x, b
+
+    def estimate_spectral_radius(self, num_steps=20, seed=0):
+        """Power-iteration estimate of the spectral radius of the iteration matrix."""
+        v = np.random.default_rng(seed).standard_normal(len(self.b))
+        v /= np.linalg.norm(v)
+        growth = []
+        for _ in range(num_steps):
+            v = self.apply_iteration_matrix(v)
+            norm = np.linalg.norm(v)
+            if norm == 0:
+                return 0.0
+            growth.append(np.log(norm))
+            v /= norm
+        # averaging the last few growth factors smooths out complex dominant eigenvalue pairs
+        return float(np.exp(np.mean(growth[-4:])))
+
+    def convergence_estimate(self, error_threshold, num_steps=20):
+        """Estimate the spectral radius and the sweeps needed to reach ``error_threshold``."""
+        rho = self.estimate_spectral_radius(num_steps)
+        if rho >= 1:
+            iterations = None
+        elif rho == 0:
+            iterations = 1
+        else:
+            iterations = int(np.ceil(np.log(error_threshold) / np.log(rho)))
+        self.estimate = {
+            'spectral_radius': rho,
+            'converges': rho < 1,
+            'predicted_iterations': iterations,
+        }
+        return self.estimate
 
-    def solve_by_error(self, error_threshold,max_iterations=10000):
+    def solve_by_error(self, error_threshold,max_iterations=10000, precheck=False, fallback=None,
+                       check_every=1, history=None):
+        # precheck: reject (or hand to the ``fallback`` solver class) systems
+        # predicted to diverge or to need more than max_iterations sweeps.
+        # check_every: measure the error only on every k-th sweep.
+        # history: True or a preallocated array to record each measured error;
+        # the recorded part is left in self.history.
+        if precheck and self.stationary:
+            estimate = self.convergence_estimate(error_threshold)
+            iterations = estimate['predicted_iterations']
+            if iterations is None or iterations > max_iterations:
+                if fallback is not None:
+                    self.fallback_solver = fallback(self.A, self.b, self.x)
+                    self.x = self.fallback_solver.solve_by_error(error_threshold, max_iterations)
+                    return self.x.copy()
+                raise ConvergenceError(
+                    "iterative method is not expected to converge within the maximum number of iterations "
+                    f"(estimated spectral radius {estimate['spectral_radius']:.4g}).")
 
-        for _ in range(max_iterations):
-            prev_x = self.x.copy()
+        if history is True:
+            history = np.empty(max_iterations // check_every)
+        prev_x = np.empty_like(self.x)
+        diff = np.empty_like(self.x)
+        recorded = 0
+
+        for iteration in range(1, max_iterations + 1):
+            check = iteration % check_every == 0
+            if check:
+                np.copyto(prev_x, self.x)
             self.nextStep()
-            
-            error = np.linalg.norm(self.x - prev_x) / (np.linalg.norm(self.x))
+            if not check:
+                continue
+
+            np.subtract(self.x, prev_x, out=diff)
+            error = np.sqrt(diff @ diff) / np.sqrt(self.x @ self.x)
+            if history is not None and recorded < len(history):
+                history[recorded] = error
+                recorded += 1
 
             if (error < error_threshold):
-                return self.x
+                self.history = None if history is None else history[:recorded]
+                return self.x.copy()
              
-        raise ValueError("iterative method did not converge within the maximum number of iterations.")
+        self.history = None if history is None else history[:recorded]
+        raise ConvergenceError("iterative method did not converge within the maximum number of iterations.")
 
 class JacobiSolver(IterativeSolver):
     def nextStep(self):
-        n = len(self.b)
-        new_x = np.zeros_like(self.x)
-        
-        for i in range(n):
-            summation = sum(
-                self.A[i][j] * self.x[j] 
-                for j in range(n) if j != i
-            )
-            new_x[i] = (self.b[i] - summation) / self.A[i][i]
-        
-        self.x = new_x
+        # x_new = x + D^-1 (b - A x): one matrix-vector product written into the
+        # spare buffer, which then becomes the current iterate
+        x, x_next = self.x, self.x_next
+        if isinstance(self.A, np.ndarray):
+            np.dot(self.A, x, out=x_next)
+        else:
+            x_next[:] = self.A @ x
+        np.subtract(self.b, x_next, out=x_next)
+        x_next /= self.diag
+        x_next += x
+        self.x, self.x_next = x_next, x
 
 class GaussSeidelSolver(IterativeSolver):
+    # relaxation factor; SORSolver changes it, 1 is plain Gauss-Seidel
+    omega = 1.0
+
+    def __init__(self, A, b, x0=None, block_size=64):
+        super().__init__(A, b, x0)
+        self.block_size = block_size
+
+    def relax(self, x, i, value):
+        x[i] = value if self.omega == 1 else x[i] + self.omega * (value - x[i])
+
     def nextStep(self):
+        if self.sparse:
+            self.sparse_sweep()
+        else:
+            self.dense_sweep()
+
+    def sparse_sweep(self):
+        # one pass over the stored nonzeros of each row, in row order
+        A, b, x, diag = self.A, self.b, self.x, self.diag
+        for i in range(len(b)):
+            cols, values = A.row(i)
+            self.relax(x, i, (b[i] - values @ x[cols] + diag[i] * x[i]) / diag[i])
+
+    def dense_sweep(self):
         n = len(self.b)
-        
-        for i in range(n):
-            summation = sum(
-                self.A[i][j] * self.x[j] 
-                for j in range(n) if j != i
-            )
-            self.x[i] = (self.b[i] - summation) / self.A[i][i]
\ No newline at end of file
+        x = self.x
+
+        # Rows are swept in blocks: everything outside the block is one
+        # matrix-vector product, only the triangular solve inside it is sequential.
+        for start in range(0, n, self.block_size):
+            end = min(start + self.block_size, n)
+            block = self.A[start:end, start:end]
+            rhs = (self.b[start:end]
+                   - self.A[start:end, :start] @ x[:start]
+                   - self.A[start:end, end:] @ x[end:]
+                   - np.triu(block, 1) @ x[start:end])
+            for i in range(end - start):
+                self.relax(x, start + i, (rhs[i] - block[i, :i] @ x[start:start + i]) / block[i, i])
+
+class SORSolver(GaussSeidelSolver):
+    """Successive over-relaxation.
+
+    ``omega='auto'`` picks Young's optimal factor 2 / (1 + sqrt(1 - rho_J^2))
+    from a power-iteration estimate of the Jacobi spectral radius rho_J.
+    ``ordering='red-black'`` colours the matrix graph so that no two rows of
+    one colour are coupled (two colours for 5-point grids, more in general)
+    and updates each colour as a single vectorized block.
+    """
+
+    def __init__(self, A, b, x0=None, omega='auto', ordering='natural', block_size=64):
+        super().__init__(A, b, x0, block_size)
+        if ordering not in ('natural', 'red-black'):
+            raise ValueError(f"Unknown ordering '{ordering}'")
+        self.ordering = ordering
+        if ordering == 'red-black':
+            self.colors = greedy_coloring(self.A)
+            self.color_rows = [self.A.take_rows(rows) if self.sparse else self.A[rows] for rows in self.colors]
+        self.omega = self.optimal_omega() if omega == 'auto' else float(omega)
+
+    def optimal_omega(self, num_steps=100):
+        rho = JacobiSolver(self.A, self.b).estimate_spectral_radius(num_steps)
+        if rho >= 1:
+            return 1.0
+        return 2 / (1 + np.sqrt(1 - rho ** 2))
+
+    def nextStep(self):
+        if self.ordering == 'natural':
+            return super().nextStep()
+        x = self.x
+        for rows, A_rows in zip(self.colors, self.color_rows):
+            # rows of one colour are not coupled, so they can all be updated at once
+            x[rows] += self.omega * (self.b[rows] - A_rows @ x) / self.diag[rows]
+
+class ConjugateGradientSolver(IterativeSolver):
+    """(Preconditioned) conjugate gradients for symmetric positive definite A.
+
+    ``preconditioner`` is None, 'jacobi', 'ichol', an object with ``solve(r)``
+    or a callable. Each ``nextStep`` is one CG iteration; ``x0`` warm-starts it.
+    """
+
+    requires_diagonal = False
+    stationary = False
+
+    def __init__(self, A, b, x0=None, preconditioner=None):
+        super().__init__(A, b, x0)
+        self.M = make_preconditioner(preconditioner, self.A)
+        self.r = self.b - self.A @ self.x
+        self.z = self.precondition(self.r)
+        self.p = self.z.copy()
+        self.rz = self.r @ self.z
+
+    def precondition(self, r):
+        return r.copy() if self.M is None else self.M.solve(r)
+
+    def nextStep(self):
+        if self.rz == 0:
+            return
+        Ap = self.A @ self.p
+        alpha = self.rz / (self.p @ Ap)
+        self.x += alpha * self.p
+        self.r -= alpha * Ap
+        self.z = self.precondition(self.r)
+        rz = self.r @ self.z
+        self.p = self.z + (rz / self.rz) * self.p
+        self.rz = rz
+
+class GMRESSolver(IterativeSolver):
+    """Restarted GMRES(m) with right preconditioning, for general nonsymmetric A.
+
+    ``A`` may be a matrix, a ``CSRMatrix``, a ``LinearOperator`` or a plain
+    function ``x -> A @ x``. Each ``nextStep`` is one restart cycle of at most
+    ``restart`` Arnoldi steps, cut short once the relative residual is below
+    ``tol``. The estimated residual norm after every Arnoldi step is appended
+    to ``residual_history``.
+    """
+
+    requires_diagonal = False
+    stationary = False
+
+    def __init__(self, A, b, x0=None, restart=30, preconditioner=None, tol=1e-12):
+        super().__init__(A, b, x0)
+        self.restart = restart
+        self.tol = tol
+        self.M = make_preconditioner(preconditioner, self.A)
+        self.b_norm = np.linalg.norm(self.b) or 1.0
+        self.residual_history = [np.linalg.norm(self.b - self.A @ self.x)]
+
+    def precondition(self, v):
+        return v if self.M is None else self.M.solve(v)
+
+    def nextStep(self):
+        r = self.b - self.A @ self.x
+        beta = np.linalg.norm(r)
+        if beta <= self.tol * self.b_norm:
+            return
+
+        m, n = self.restart, len(self.b)
+        V = np.zeros((m + 1, n))
+        H = np.zeros((m + 1, m))
+        cs, sn = np.zeros(m), np.zeros(m)
+        g = np.zeros(m + 1)
+        g[0] = beta
+        V[0] = r / beta
+
+        k = 0
+        while k < m:
+            w = self.A @ self.precondition(V[k])
+            # classical Gram-Schmidt applied twice: two matrix-vector products per pass
+            for _ in range(2):
+                h = V[:k + 1] @ w
+                w -= h @ V[:k + 1]
+                H[:k + 1, k] += h
+            H[k + 1, k] = np.linalg.norm(w)
+            breakdown = H[k + 1, k] <= 1e-14 * np.linalg.norm(H[:k + 1, k])
+            if not breakdown:
+                V[k + 1] = w / H[k + 1, k]
+
+            for i in range(k):
+                H[i, k], H[i + 1, k] = (cs[i] * H[i, k] + sn[i] * H[i + 1, k],
+                                        -sn[i] * H[i, k] + cs[i] * H[i + 1, k])
+            rho = np.hypot(H[k, k], H[k + 1, k])
+            cs[k], sn[k] = H[k, k] / rho, H[k + 1, k] / rho
+            H[k, k], H[k + 1, k] = rho, 0.0
+            g[k], g[k + 1] = cs[k] * g[k], -sn[k] * g[k]
+
+            k += 1
+            self.residual_history.append(abs(g[k]))
+            if breakdown or abs(g[k]) <= self.tol * self.b_norm:
+                break
+
+        y = np.zeros(k)
+        for i in reversed(range(k)):
+            y[i] = (g[i] - H[i, i + 1:k] @ y[i + 1:]) / H[i, i]
+        self.x += self.precondition(y @ V[:k])
+
+class BiCGSTABSolver(IterativeSolver):
+    """BiCGSTAB with right preconditioning, for general nonsymmetric A.
+
+    Accepts the same operators and preconditioners as ``GMRESSolver``; each
+    ``nextStep`` is one iteration and appends the residual norm to
+    ``residual_history``.
+    """
+
+    requires_diagonal = False
+    stationary = False
+
+    def __init__(self, A, b, x0=None, preconditioner=None):
+        super().__init__(A, b, x0)
+        self.M = make_preconditioner(preconditioner, self.A)
+        self.r = self.b - self.A @ self.x
+        self.r_hat = self.r.copy()
+        self.rho = self.alpha = self.omega = 1.0
+        self.v = np.zeros_like(self.b)
+        self.p = np.zeros_like(self.b)
+        self.residual_history = [np.linalg.norm(self.r)]
+
+    def precondition(self, v):
+        return v if self.M is None else self.M.solve(v)
+
+    def nextStep(self):
+        if not self.r.any():
+            return
+        rho = self.r_hat @ self.r
+        if rho == 0:
+            # the shadow residual became orthogonal: restart from the current residual
+            self.r_hat = self.r.copy()
+            self.rho = self.alpha = self.omega = 1.0
+            self.v[:] = 0
+            self.p[:] = 0
+            rho = self.r @ self.r
+
+        beta = (rho / self.rho) * (self.alpha / self.omega)
+        self.p = self.r + beta * (self.p - self.omega * self.v)
+        p_hat = self.precondition(self.p)
+        self.v = self.A @ p_hat
+        self.alpha = rho / (self.r_hat @ self.v)
+        s = self.r - self.alpha * self.v
+        self.rho = rho
+
+        if not s.any():
+            self.x += self.alpha * p_hat
+            self.r = s
+            self.residual_history.append(0.0)
+            return
+
+        s_hat = self.precondition(s)
+        t = self.A @ s_hat
+        self.omega = (t @ s) / (t @ t)
+        self.x += self.alpha * p_hat + self.omega * s_hat
+        self.r = s - self.omega * t
+        self.residual_history.append(np.linalg.norm(self.r))
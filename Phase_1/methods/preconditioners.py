@@ -0,0 +1,195 @@
+import numpy as np
+
+from sparseMatrix import CSRMatrix, LinearOperator, TriangularSolver
+
+
+class BreakdownError(ValueError):
+    """An incomplete factorization hit a pivot it cannot divide by."""
+
+
+class JacobiPreconditioner:
+    """M = diag(A); a ``LinearOperator`` must be given its diagonal."""
+
+    def __init__(self, A):
+        diag = A.diagonal() if hasattr(A, 'diagonal') else np.diag(A)
+        self.inv_diag = 1.0 / diag
+
+    def solve(self, r):
+        return r * self.inv_diag
+
+
+class IncompleteCholeskyPreconditioner:
+    """IC(0): M = L L^T with L restricted to the sparsity pattern of the lower triangle of A.
+
+    If a pivot breaks down (possible for IC(0) even on SPD matrices) the
+    factorization is retried on ``A + shift * diag(A)`` with growing shifts.
+    """
+
+    def __init__(self, A, max_shifts=10):
+        if isinstance(A, LinearOperator):
+            raise ValueError("Incomplete Cholesky needs the entries of A, not a matrix-free operator")
+        self.sparse = isinstance(A, CSRMatrix)
+        shift = 0.0
+        for _ in range(max_shifts):
+            try:
+                self.L = self.factor_sparse(A, shift) if self.sparse else self.factor_dense(A, shift)
+                break
+            except BreakdownError:
+                shift = max(2 * shift, 1e-3)
+        else:
+            raise BreakdownError("Incomplete Cholesky factorization broke down")
+        self.shift = shift
+        if self.sparse:
+            L_diag = self.L.diagonal()
+            self.forward = TriangularSolver(self.L, lower=True, diagonal=L_diag)
+            self.backward = TriangularSolver(self.L.transpose(), lower=False, diagonal=L_diag)
+
+    @staticmethod
+    def factor_dense(A, shift):
+        n = len(A)
+        pattern = np.tril(A) != 0
+        L = np.zeros_like(A, dtype=float)
+        for j in range(n):
+            pivot = A[j, j] * (1 + shift) - L[j, :j] @ L[j, :j]
+            if pivot <= 0:
+                raise BreakdownError("Non-positive pivot")
+            L[j, j] = np.sqrt(pivot)
+            column = (A[j + 1:, j] - L[j + 1:, :j] @ L[j, :j]) / L[j, j]
+            L[j + 1:, j] = np.where(pattern[j + 1:, j], column, 0)
+        return L
+
+    @staticmethod
+    def factor_sparse(A, shift):
+        n = A.shape[0]
+        rows = []
+        for i in range(n):
+            cols, values = A.row(i)
+            lower = {int(c): v for c, v in zip(cols, values) if c < i}
+            row = {}
+            for k in sorted(lower):
+                other = rows[k]
+                small, large = (row, other) if len(row) < len(other) else (other, row)
+                s = sum(v * large[j] for j, v in small.items() if j in large and j < k)
+                row[k] = (lower[k] - s) / other[k]
+            diag = values[cols == i].sum() * (1 + shift) - sum(v * v for v in row.values())
+            if diag <= 0:
+                raise BreakdownError("Non-positive pivot")
+            row[i] = np.sqrt(diag)
+            rows.append(row)
+
+        indptr = np.zeros(n + 1, dtype=np.intp)
+        np.cumsum([len(row) for row in rows], out=indptr[1:])
+        indices = [j for row in rows for j in sorted(row)]
+        data = [row[j] for row in rows for j in sorted(row)]
+        return CSRMatrix(data, indices, indptr, (n, n))
+
+    def solve(self, r):
+        n = len(r)
+        y = np.array(r, dtype=float)
+        if not self.sparse:
+            L = self.L
+            for i in range(n):
+                y[i] = (y[i] - L[i, :i] @ y[:i]) / L[i, i]
+            for i in reversed(range(n)):
+                y[i] = (y[i] - L[i + 1:, i] @ y[i + 1:]) / L[i, i]
+            return y
+
+        return self.backward.solve(self.forward.solve(y))
+
+
+class IncompleteLUPreconditioner:
+    """ILU(0): M = L U with both factors restricted to the sparsity pattern of A."""
+
+    def __init__(self, A):
+        if isinstance(A, LinearOperator):
+            raise ValueError("Incomplete LU needs the entries of A, not a matrix-free operator")
+        self.sparse = isinstance(A, CSRMatrix)
+        if self.sparse:
+            L, U = self.factor_sparse(A)
+            self.forward = TriangularSolver(L, lower=True)
+            self.backward = TriangularSolver(U, lower=False, diagonal=U.diagonal())
+        else:
+            self.LU = self.factor_dense(np.array(A, dtype=float))
+
+    @staticmethod
+    def factor_dense(LU):
+        pattern = LU != 0
+        for k in range(len(LU) - 1):
+            if LU[k, k] == 0:
+                raise BreakdownError(f"Zero pivot in incomplete LU at row {k}")
+            LU[k + 1:, k] = np.where(pattern[k + 1:, k], LU[k + 1:, k] / LU[k, k], 0)
+            update = np.outer(LU[k + 1:, k], LU[k, k + 1:])
+            LU[k + 1:, k + 1:] -= np.where(pattern[k + 1:, k + 1:], update, 0)
+        return LU
+
+    @staticmethod
+    def factor_sparse(A):
+        n = A.shape[0]
+        rows = []
+        for i in range(n):
+            cols, values = A.row(i)
+            row = {}
+            for c, v in zip(cols, values):
+                row[int(c)] = row.get(int(c), 0.0) + v
+            for k in sorted(c for c in row if c < i):
+                pivot_row = rows[k]
+                if pivot_row.get(k, 0) == 0:
+                    raise BreakdownError(f"Zero pivot in incomplete LU at row {k}")
+                factor = row[k] / pivot_row[k]
+                row[k] = factor
+                for j, u in pivot_row.items():
+                    if j > k and j in row:
+                        row[j] -= factor * u
+            rows.append(row)
+
+        def build(select):
+            parts = [sorted((j, v) for j, v in row.items() if select(i, j)) for i, row in enumerate(rows)]
+            indptr = np.zeros(n + 1, dtype=np.intp)
+            np.cumsum([len(part) for part in parts], out=indptr[1:])
+            return CSRMatrix([v for part in parts for _, v in part],
+                             [j for part in parts for j, _ in part], indptr, (n, n))
+
+        return build(lambda i, j: j < i), build(lambda i, j: j >= i)
+
+    def solve(self, r):
+        n = len(r)
+        y = np.array(r, dtype=float)
+        if not self.sparse:
+            LU = self.LU
+            for i in range(1, n):
+                y[i] -= LU[i, :i] @ y[:i]
+            for i in reversed(range(n)):
+                y[i] = (y[i] - LU[i, i + 1:] @ y[i + 1:]) / LU[i, i]
+            return y
+
+        return self.backward.solve(self.forward.solve(y))
+
+
+class CallablePreconditioner:
+    def __init__(self, function):
+        self.function = function
+
+    def solve(self, r):
+        return self.function(r)
+
+
+PRECONDITIONERS = {
+    'jacobi': JacobiPreconditioner,
+    'ichol': IncompleteCholeskyPreconditioner,
+    'ilu0': IncompleteLUPreconditioner,
+}
+
+
+def make_preconditioner(preconditioner, A):
+    """Build a preconditioner from a name in ``PRECONDITIONERS``, an object with ``solve(r)`` or a callable."""
+    if preconditioner is None:
+        return None
+    if isinstance(preconditioner, str):
+        if preconditioner not in PRECONDITIONERS:
+            raise ValueError(f"Unknown preconditioner '{preconditioner}'")
+        return PRECONDITIONERS[preconditioner](A)
+    if hasattr(preconditioner, 'solve'):
+        return preconditioner
+    if callable(preconditioner):
+        return CallablePreconditioner(preconditioner)
+    raise ValueError("Preconditioner must be a name, an object with solve(r) or a callable")
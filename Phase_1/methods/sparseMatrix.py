@@ -0,0 +1,187 @@
+import numpy as np
+
+
+class CSRMatrix:
+    """Compressed sparse row matrix: memory and products scale with the stored nonzeros."""
+
+    def __init__(self, data, indices, indptr, shape):
+        self.data = np.asarray(data, dtype=float)
+        self.indices = np.asarray(indices, dtype=np.intp)
+        self.indptr = np.asarray(indptr, dtype=np.intp)
+        self.shape = tuple(shape)
+        # row index of every stored entry, for vectorized products
+        self.row_ids = np.repeat(np.arange(self.shape[0]), np.diff(self.indptr))
+
+    @classmethod
+    def from_dense(cls, A):
+        A = np.asarray(A, dtype=float)
+        rows, cols = np.nonzero(A)
+        indptr = np.zeros(A.shape[0] + 1, dtype=np.intp)
+        np.cumsum(np.bincount(rows, minlength=A.shape[0]), out=indptr[1:])
+        return cls(A[rows, cols], cols, indptr, A.shape)
+
+    @classmethod
+    def from_scipy(cls, M):
+        M = M.tocsr()
+        return cls(M.data, M.indices, M.indptr, M.shape)
+
+    @property
+    def nnz(self):
+        return len(self.data)
+
+    def diagonal(self):
+        diag = np.zeros(min(self.shape))
+        on_diag = self.row_ids == self.indices
+        np.add.at(diag, self.indices[on_diag], self.data[on_diag])
+        return diag
+
+    def bandwidth(self):
+        """Lower and upper bandwidth ``(kl, ku)`` of the stored entries, in O(nnz)."""
+        if not self.nnz:
+            return 0, 0
+        offsets = self.indices - self.row_ids
+        return max(0, -int(offsets.min())), max(0, int(offsets.max()))
+
+    def to_banded(self, kl, ku):
+        """LAPACK band storage ``ab[ku + i - j, j] = A[i, j]`` (see ``bandedSolvers``)."""
+        ab = np.zeros((kl + ku + 1, self.shape[1]))
+        np.add.at(ab, (ku + self.row_ids - self.indices, self.indices), self.data)
+        return ab
+
+    def row(self, i):
+        lo, hi = self.indptr[i], self.indptr[i + 1]
+        return self.indices[lo:hi], self.data[lo:hi]
+
+    def take_rows(self, rows):
+        """Sub-matrix made of the given rows, keeping all columns."""
+        rows = np.asarray(rows, dtype=np.intp)
+        counts = self.indptr[rows + 1] - self.indptr[rows]
+        indptr = np.zeros(len(rows) + 1, dtype=np.intp)
+        np.cumsum(counts, out=indptr[1:])
+        entries = np.repeat(self.indptr[rows] - indptr[:-1], counts) + np.arange(indptr[-1])
+        return CSRMatrix(self.data[entries], self.indices[entries], indptr, (len(rows), self.shape[1]))
+
+    def transpose(self):
+        order = np.argsort(self.indices, kind='stable')
+        indptr = np.zeros(self.shape[1] + 1, dtype=np.intp)
+        np.cumsum(np.bincount(self.indices, minlength=self.shape[1]), out=indptr[1:])
+        return CSRMatrix(self.data[order], self.row_ids[order], indptr, self.shape[::-1])
+
+    @property
+    def T(self):
+        return self.transpose()
+
+    def dot(self, x):
+        x = np.asarray(x, dtype=float)
+        return np.bincount(self.row_ids, weights=self.data * x[self.indices], minlength=self.shape[0])
+
+    def __matmul__(self, x):
+        return self.dot(x)
+
+    def toarray(self):
+        A = np.zeros(self.shape)
+        np.add.at(A, (self.row_ids, self.indices), self.data)
+        return A
+
+
+class LinearOperator:
+    """Matrix-free operator: only ``matvec(x)`` (and optionally the diagonal) is known."""
+
+    def __init__(self, shape, matvec, diagonal=None):
+        self.shape = tuple(shape)
+        self.matvec = matvec
+        self.diag = None if diagonal is None else np.asarray(diagonal, dtype=float)
+
+    def diagonal(self):
+        if self.diag is None:
+            raise ValueError("Operator has no known diagonal")
+        return self.diag
+
+    def dot(self, x):
+        return np.asarray(self.matvec(x), dtype=float)
+
+    def __matmul__(self, x):
+        return self.dot(x)
+
+
+def greedy_coloring(A):
+    """Split the rows into colours with no coupling A[i, j] or A[j, i] inside a colour.
+
+    Returns one index array per colour. A 5-point grid in natural order
+    gets the two red-black colours.
+    """
+    A = A if isinstance(A, CSRMatrix) else CSRMatrix.from_dense(A)
+    AT = A.transpose()
+    n = A.shape[0]
+    colors = np.full(n, -1, dtype=np.intp)
+    for i in range(n):
+        neighbours = np.concatenate((A.row(i)[0], AT.row(i)[0]))
+        used = set(colors[neighbours[neighbours != i]].tolist())
+        color = 0
+        while color in used:
+            color += 1
+        colors[i] = color
+    return [np.flatnonzero(colors == c) for c in range(colors.max() + 1)] if n else []
+
+
+class TriangularSolver:
+    """Solve with the lower or upper triangle of a CSR matrix, one vectorized update per level.
+
+    A row's level is one more than the highest level among the unknowns it
+    depends on, so all rows of a level can be solved at once. A 5-point
+    grid in natural order has about 2 sqrt(n) levels instead of n rows.
+    ``diagonal=None`` means a unit diagonal; entries on and beyond the
+    diagonal of T are ignored.
+    """
+
+    def __init__(self, T, lower=True, diagonal=None):
+        n = T.shape[0]
+        strict = T.indices < T.row_ids if lower else T.indices > T.row_ids
+        rows, cols, values = T.row_ids[strict], T.indices[strict], T.data[strict]
+        indptr = np.zeros(n + 1, dtype=np.intp)
+        np.cumsum(np.bincount(rows, minlength=n), out=indptr[1:])
+
+        level = np.zeros(n, dtype=np.intp)
+        for i in (range(n) if lower else reversed(range(n))):
+            dependencies = cols[indptr[i]:indptr[i + 1]]
+            if len(dependencies):
+                level[i] = level[dependencies].max() + 1
+
+        # rows and entries grouped by level, in stable order
+        levels = np.arange(level.max() + 2 if n else 1)
+        row_order = np.argsort(level, kind='stable')
+        row_bounds = np.searchsorted(level[row_order], levels)
+        entry_levels = level[rows]
+        order = np.argsort(entry_levels, kind='stable')
+        bounds = np.searchsorted(entry_levels[order], levels)
+
+        position = np.empty(n, dtype=np.intp)
+        self.levels = []
+        for k in range(len(levels) - 1):
+            level_rows = row_order[row_bounds[k]:row_bounds[k + 1]]
+            position[level_rows] = np.arange(len(level_rows))
+            entries = order[bounds[k]:bounds[k + 1]]
+            self.levels.append((level_rows, position[rows[entries]], cols[entries], values[entries]))
+        self.diagonal = diagonal
+
+    def solve(self, y):
+        """Overwrite ``y`` with the solution and return it."""
+        for level_rows, local, cols, values in self.levels:
+            if len(cols):
+                y[level_rows] -= np.bincount(local, weights=values * y[cols], minlength=len(level_rows))
+            if self.diagonal is not None:
+                y[level_rows] /= self.diagonal[level_rows]
+        return y
+
+
+def is_sparse(A):
+    return isinstance(A, CSRMatrix) or hasattr(A, 'tocsr')
+
+
+def as_matrix(A):
+    """A ``CSRMatrix`` for sparse input (ours or scipy.sparse), operators unchanged, otherwise a dense float array."""
+    if isinstance(A, (CSRMatrix, LinearOperator)):
+        return A
+    if hasattr(A, 'tocsr'):
+        return CSRMatrix.from_scipy(A)
+    return np.array(A, dtype=float)
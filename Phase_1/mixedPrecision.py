@@ -0,0 +1,114 @@
+import numpy as np
+
+from LU.LU import LUFactorization, lu_factor, lu_solve
+from cholsekyDecomposition import blocked_cholesky, cholesky_solve
+
+# Mixed-precision direct solves: A is factored once in float32 (half the
+# memory and bandwidth of float64), and float64 accuracy is then recovered
+# by iterative refinement on residuals computed in float64. If refinement
+# stops converging, the system is refactored and solved in float64.
+
+# largest number of refinement steps before falling back (as in LAPACK dsgesv)
+MAX_REFINEMENTS = 30
+# a step that shrinks the residual by less than this factor counts as stalled
+STALL_RATIO = 0.5
+
+
+class MixedPrecisionSolver:
+    """Factor A in float32 and solve to float64 accuracy with iterative refinement.
+
+    ``method`` is 'lu' or 'cholesky' (A symmetric positive definite). After
+    each ``solve`` the attributes ``iterations``, ``converged`` and
+    ``fell_back`` describe how the answer was obtained.
+    """
+
+    def __init__(self, A, method='lu', max_refinements=MAX_REFINEMENTS, stall_ratio=STALL_RATIO):
+        if method not in ('lu', 'cholesky'):
+            raise ValueError(f"Unknown method {method!r}: expected 'lu' or 'cholesky'")
+        self.A = np.asarray(A, dtype=float)
+        if self.A.ndim != 2 or self.A.shape[0] != self.A.shape[1]:
+            raise ValueError("Matrix must be square")
+        self.method = method
+        self.n = len(self.A)
+        self.max_refinements = max_refinements
+        self.stall_ratio = stall_ratio
+        self.norm = np.max(np.abs(self.A).sum(axis=1)) if self.n else 0.0
+        self.factors = None
+        self.full = None
+        self.iterations = 0
+        self.converged = False
+        self.fell_back = False
+
+        # entries outside the float32 range go straight to full precision
+        if np.all(np.abs(self.A) < np.finfo(np.float32).max):
+            try:
+                if method == 'lu':
+                    self.factors = lu_factor(self.A, dtype=np.float32)
+                else:
+                    self.factors = blocked_cholesky(self.A, dtype=np.float32)
+            except ValueError:
+                self.factors = None
+
+    def solve_low(self, r):
+        """Apply the float32 factorization to a float64 residual; the result is float64.
+
+        The residual is scaled to unit size first so it neither underflows nor
+        overflows in float32.
+        """
+        scale = np.max(np.abs(r))
+        if scale == 0:
+            return np.zeros_like(r)
+        if self.method == 'lu':
+            d = lu_solve(*self.factors, r / scale)
+        else:
+            d = cholesky_solve(self.factors, r / scale)
+        return d.astype(float) * scale
+
+    def solve_full(self, b):
+        if self.full is None:
+            if self.method == 'lu':
+                self.full = LUFactorization(self.A)
+            else:
+                L = blocked_cholesky(self.A)
+                self.full = lambda B: cholesky_solve(L, B)
+        return self.full.solve(b) if self.method == 'lu' else self.full(b)
+
+    def converged_at(self, x, r):
+        # normwise backward error test: ||r|| <= sqrt(n) * eps * ||A|| * ||x||
+        return np.max(np.abs(r)) <= np.sqrt(self.n) * np.finfo(float).eps * self.norm * np.max(np.abs(x))
+
+    def solve(self, b):
+        """Solve ``A x = b`` for a vector ``(n,)`` or a matrix ``(n, m)`` of right-hand sides."""
+        b = np.asarray(b, dtype=float)
+        if b.shape[0] != self.n:
+            raise ValueError(f"Right-hand side must have {self.n} rows, got {b.shape[0]}")
+        self.iterations = 0
+        self.converged = False
+        self.fell_back = False
+
+        if self.factors is not None:
+            x = self.solve_low(b)
+            r = b - self.A @ x
+            previous = np.inf
+            while np.all(np.isfinite(x)) and self.iterations < self.max_refinements:
+                if self.converged_at(x, r):
+                    self.converged = True
+                    return x
+                size = np.max(np.abs(r))
+                if size > self.stall_ratio * previous:
+                    break
+                previous = size
+                x += self.solve_low(r)
+                r = b - self.A @ x
+                self.iterations += 1
+            if np.all(np.isfinite(x)) and self.converged_at(x, r):
+                self.converged = True
+                return x
+
+        self.fell_back = True
+        return self.solve_full(b)
+
+
+def mixed_precision_solve(A, b, method='lu'):
+    """Solve ``A x = b`` with a float32 factorization refined to float64 accuracy."""
+    return MixedPrecisionSolver(A, method).solve(b)
@@ -0,0 +1,178 @@
+import os
+
+import numpy as np
+
+# Out-of-core LU and Cholesky for matrices kept in files through np.memmap.
+# A is read, and the factor written, one column panel at a time; the panel
+# width is chosen so that the two panels held in memory at once (the panel
+# being factored and one earlier panel applying its update) fit within
+# ``memory_budget`` bytes. Both factorizations are left-looking, so every
+# panel is written exactly once and earlier panels are only ever read back.
+# ``out`` may be a memmap, an ndarray, a file path (created), or A itself.
+
+DEFAULT_BUDGET = 256 * 1024 * 1024
+
+
+def panel_width(n, memory_budget=DEFAULT_BUDGET, itemsize=8):
+    """Widest column panel such that two ``n``-row panels (plus slack) fit in the budget."""
+    return int(max(1, min(n, memory_budget // (3 * max(n, 1) * itemsize))))
+
+
+def panels(n, width):
+    return [(start, min(start + width, n)) for start in range(0, n, width)]
+
+
+def open_matrix(path, n, mode='r'):
+    """Map an ``(n, n)`` float64 matrix stored row-major in a file."""
+    return np.memmap(path, dtype=np.float64, mode=mode, shape=(n, n))
+
+
+def as_output(out, n):
+    if isinstance(out, (str, os.PathLike)):
+        return open_matrix(out, n, mode='w+')
+    if out.shape != (n, n):
+        raise ValueError(f"Output must have shape ({n}, {n})")
+    return out
+
+
+def check_square(A):
+    if A.ndim != 2 or A.shape[0] != A.shape[1]:
+        raise ValueError("Matrix must be square")
+    return len(A)
+
+
+def flush(M):
+    if isinstance(M, np.memmap):
+        M.flush()
+
+
+def ooc_lu_factor(A, out, memory_budget=DEFAULT_BUDGET, tol=1e-9):
+    """Packed LU with partial pivoting, ``A[perm] = L @ U``, written to ``out``.
+
+    While factoring, each finished panel is stored in the original row order,
+    so later row swaps only change ``perm`` and never rewrite earlier panels;
+    a final pass puts every panel in pivoted order. Returns ``(lu, perm)``.
+    """
+    n = check_square(A)
+    lu = as_output(out, n)
+    width = panel_width(n, memory_budget)
+    blocks = panels(n, width)
+    perm = np.arange(n)
+
+    scale = max((np.max(np.abs(A[:, s:e])) for s, e in blocks), default=0)
+
+    for j0, j1 in blocks:
+        P = np.array(A[:, j0:j1], dtype=float)[perm]
+        for k0, k1 in blocks:
+            if k0 >= j0:
+                break
+            L = np.array(lu[:, k0:k1])[perm]
+            for i in range(k0 + 1, k1):
+                P[i] -= L[i, :i - k0] @ P[k0:i]
+            P[k1:] -= L[k1:] @ P[k0:k1]
+
+        for k in range(j0, j1):
+            c = k - j0
+            p = k + np.abs(P[k:, c]).argmax()
+            if p != k:
+                P[[k, p]] = P[[p, k]]
+                perm[[k, p]] = perm[[p, k]]
+            if scale == 0 or abs(P[k, c]) < tol * scale:
+                raise ValueError(f"Zero pivot encountered at row {k}. Matrix is singular.")
+            P[k + 1:, c] /= P[k, c]
+            P[k + 1:, c + 1:] -= np.outer(P[k + 1:, c], P[k, c + 1:])
+
+        lu[perm, j0:j1] = P
+
+    for k0, k1 in blocks:
+        lu[:, k0:k1] = np.array(lu[:, k0:k1])[perm]
+    flush(lu)
+    return lu, perm
+
+
+def ooc_lu_solve(lu, perm, b, memory_budget=DEFAULT_BUDGET, out=None):
+    """Solve with a factor from ``ooc_lu_factor``, streaming one column panel at a time."""
+    n = len(lu)
+    x = np.array(b, dtype=float)[perm]
+    blocks = panels(n, panel_width(n, memory_budget))
+    for k0, k1 in blocks:
+        L = np.array(lu[k0:, k0:k1])
+        for i in range(1, k1 - k0):
+            x[k0 + i] -= L[i, :i] @ x[k0:k0 + i]
+        x[k1:] -= L[k1 - k0:] @ x[k0:k1]
+    for k0, k1 in reversed(blocks):
+        U = np.array(lu[:k1, k0:k1])
+        for i in reversed(range(k1 - k0)):
+            x[k0 + i] = (x[k0 + i] - U[k0 + i, i + 1:] @ x[k0 + i + 1:k1]) / U[k0 + i, i]
+        x[:k0] -= U[:k0] @ x[k0:k1]
+    return store(x, out)
+
+
+def ooc_cholesky_factor(A, out, memory_budget=DEFAULT_BUDGET):
+    """Lower Cholesky factor of a symmetric positive definite A, written to ``out``.
+
+    Only the lower triangle of A is read. Raises ValueError on a non-positive pivot.
+    """
+    n = check_square(A)
+    L = as_output(out, n)
+    blocks = panels(n, panel_width(n, memory_budget))
+
+    for j0, j1 in blocks:
+        P = np.array(A[j0:, j0:j1], dtype=float)
+        for k0, k1 in blocks:
+            if k0 >= j0:
+                break
+            Lk = np.array(L[j0:, k0:k1])
+            P -= Lk @ Lk[:j1 - j0].T
+
+        for j in range(j1 - j0):
+            pivot = P[j, j] - P[j, :j] @ P[j, :j]
+            if pivot <= 0:
+                raise ValueError("Matrix must be positive definite")
+            P[j, j] = np.sqrt(pivot)
+            P[j + 1:, j] = (P[j + 1:, j] - P[j + 1:, :j] @ P[j, :j]) / P[j, j]
+            P[:j, j] = 0
+
+        L[:j0, j0:j1] = 0
+        L[j0:, j0:j1] = P
+    flush(L)
+    return L
+
+
+def ooc_cholesky_solve(L, b, memory_budget=DEFAULT_BUDGET, out=None):
+    """Solve ``L L^T x = b`` streaming column panels of L."""
+    n = len(L)
+    x = np.array(b, dtype=float)
+    blocks = panels(n, panel_width(n, memory_budget))
+    for k0, k1 in blocks:
+        Lk = np.array(L[k0:, k0:k1])
+        for i in range(k1 - k0):
+            x[k0 + i] = (x[k0 + i] - Lk[i, :i] @ x[k0:k0 + i]) / Lk[i, i]
+        x[k1:] -= Lk[k1 - k0:] @ x[k0:k1]
+    for k0, k1 in reversed(blocks):
+        Lk = np.array(L[k0:, k0:k1])
+        x[k0:k1] -= Lk[k1 - k0:].T @ x[k1:]
+        for i in reversed(range(k1 - k0)):
+            x[k0 + i] = (x[k0 + i] - Lk[i + 1:k1 - k0, i] @ x[k0 + i + 1:k1]) / Lk[i, i]
+    return store(x, out)
+
+
+def store(x, out):
+    if out is None:
+        return x
+    if isinstance(out, (str, os.PathLike)):
+        out = np.memmap(out, dtype=np.float64, mode='w+', shape=x.shape)
+    out[...] = x
+    flush(out)
+    return out
+
+
+def solve_out_of_core(A, b, factor_out, method='lu', memory_budget=DEFAULT_BUDGET, out=None):
+    """Factor A into ``factor_out`` and solve ``A x = b``; x is written to ``out`` if given."""
+    if method == 'lu':
+        lu, perm = ooc_lu_factor(A, factor_out, memory_budget)
+        return ooc_lu_solve(lu, perm, b, memory_budget, out)
+    if method == 'cholesky':
+        L = ooc_cholesky_factor(A, factor_out, memory_budget)
+        return ooc_cholesky_solve(L, b, memory_budget, out)
+    raise ValueError(f"Unknown method {method!r}: expected 'lu' or 'cholesky'")
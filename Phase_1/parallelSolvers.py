@@ -0,0 +1,152 @@
+import os
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import numpy as np
+
+from cholsekyDecomposition import blocked_cholesky
+
+# Tiled LU and Cholesky whose panel factorizations and trailing updates run
+# as a task DAG on a thread pool. Each task is a handful of NumPy calls on
+# tiles (matrix products and inverses release the GIL), so independent
+# tasks run on separate cores. A task starts as soon as the tasks it
+# depends on have finished, which gives lookahead for free: the next panel
+# can be factored while the rest of the trailing matrix is still updating.
+
+DEFAULT_TILE = 256
+
+
+def tiles(n, tile_size):
+    return [(start, min(start + tile_size, n)) for start in range(0, n, tile_size)]
+
+
+def run_tasks(tasks, workers=None):
+    """Run ``{key: (function, dependencies)}`` on a thread pool in dependency order.
+
+    The first exception raised by a task is re-raised once running tasks finish.
+    """
+    waiting = {key: set(deps) for key, (_, deps) in tasks.items()}
+    dependents = defaultdict(list)
+    for key, deps in waiting.items():
+        for dep in deps:
+            dependents[dep].append(key)
+
+    with ThreadPoolExecutor(workers or os.cpu_count()) as pool:
+        running = {pool.submit(tasks[key][0]): key for key, deps in waiting.items() if not deps}
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                key = running.pop(future)
+                future.result()
+                for dependent in dependents[key]:
+                    waiting[dependent].discard(key)
+                    if not waiting[dependent]:
+                        running[pool.submit(tasks[dependent][0])] = dependent
+
+
+def as_square(A, overwrite_a):
+    if not (overwrite_a and isinstance(A, np.ndarray) and A.dtype == np.float64):
+        A = np.array(A, dtype=float)
+    if A.ndim != 2 or A.shape[0] != A.shape[1]:
+        raise ValueError("Matrix must be square")
+    return A
+
+
+def parallel_cholesky(A, tile_size=DEFAULT_TILE, workers=None, overwrite_a=False):
+    """Lower Cholesky factor of a symmetric positive definite A, tile by tile.
+
+    Tasks per step k: factor diagonal tile k; solve the tiles below it; update
+    every trailing lower tile (i, j) with ``A_ik A_jk^T``. Only the lower
+    triangle of A is read. Raises ValueError on a non-positive pivot.
+    """
+    A = as_square(A, overwrite_a)
+    blocks = tiles(len(A), tile_size)
+    inverses = {}
+
+    def tile(i, j):
+        return A[blocks[i][0]:blocks[i][1], blocks[j][0]:blocks[j][1]]
+
+    def factor(k):
+        L = blocked_cholesky(tile(k, k), overwrite_a=True)
+        inverses[k] = np.linalg.inv(L)
+
+    def solve(i, k):
+        tile(i, k)[...] = tile(i, k) @ inverses[k].T
+
+    def update(i, j, k):
+        tile(i, j)[...] -= tile(i, k) @ tile(j, k).T
+
+    tasks = {}
+    t = len(blocks)
+    for k in range(t):
+        tasks['factor', k] = (lambda k=k: factor(k), [('update', k, k, k - 1)] if k else [])
+        for i in range(k + 1, t):
+            tasks['solve', i, k] = (lambda i=i, k=k: solve(i, k),
+                                    [('factor', k)] + ([('update', i, k, k - 1)] if k else []))
+        for i in range(k + 1, t):
+            for j in range(k + 1, i + 1):
+                tasks['update', i, j, k] = (lambda i=i, j=j, k=k: update(i, j, k),
+                                            [('solve', i, k), ('solve', j, k)]
+                                            + ([('update', i, j, k - 1)] if k else []))
+    run_tasks(tasks, workers)
+
+    for i in range(len(A) - 1):
+        A[i, i + 1:] = 0
+    return A
+
+
+def parallel_lu_factor(A, tile_size=DEFAULT_TILE, workers=None, overwrite_a=False, tol=1e-9):
+    """Packed LU with partial pivoting, ``A[perm] = L @ U``, by tile columns.
+
+    Tasks per step k: factor column panel k (pivot search over the full
+    column); for every later tile column j, apply the panel's row swaps,
+    solve for U's tile and update the tiles below it. The swaps are applied
+    to the L columns on the left once at the end. The result is the same
+    ``(lu, perm)`` as ``LU.lu_factor`` and works with ``LU.lu_solve``.
+    """
+    A = as_square(A, overwrite_a)
+    n = len(A)
+    blocks = tiles(n, tile_size)
+    piv = np.arange(n)
+    inverses = {}
+    scale = np.max(np.abs(A)) if A.size else 0
+
+    def factor(k):
+        k0, k1 = blocks[k]
+        panel = A[:, k0:k1]
+        for c in range(k0, k1):
+            p = c + np.abs(panel[c:, c - k0]).argmax()
+            piv[c] = p
+            if p != c:
+                panel[[c, p]] = panel[[p, c]]
+            if scale == 0 or abs(panel[c, c - k0]) < tol * scale:
+                raise ValueError(f"Zero pivot encountered at row {c}. Matrix is singular.")
+            panel[c + 1:, c - k0] /= panel[c, c - k0]
+            panel[c + 1:, c - k0 + 1:] -= np.outer(panel[c + 1:, c - k0], panel[c, c - k0 + 1:])
+        inverses[k] = np.linalg.inv(np.tril(A[k0:k1, k0:k1], -1) + np.eye(k1 - k0))
+
+    def update(j, k):
+        k0, k1 = blocks[k]
+        column = A[:, blocks[j][0]:blocks[j][1]]
+        for c in range(k0, k1):
+            if piv[c] != c:
+                column[[c, piv[c]]] = column[[piv[c], c]]
+        column[k0:k1] = inverses[k] @ column[k0:k1]
+        column[k1:] -= A[k1:, k0:k1] @ column[k0:k1]
+
+    tasks = {}
+    t = len(blocks)
+    for k in range(t):
+        tasks['factor', k] = (lambda k=k: factor(k), [('update', k, k - 1)] if k else [])
+        for j in range(k + 1, t):
+            tasks['update', j, k] = (lambda j=j, k=k: update(j, k),
+                                     [('factor', k)] + ([('update', j, k - 1)] if k else []))
+    run_tasks(tasks, workers)
+
+    perm = np.arange(n)
+    for k0, k1 in blocks:
+        for c in range(k0, k1):
+            if piv[c] != c:
+                A[[c, piv[c]], :k0] = A[[piv[c], c], :k0]
+                perm[[c, piv[c]]] = perm[[piv[c], c]]
+    return A, perm
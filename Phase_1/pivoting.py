@@ -0,0 +1,96 @@
+import numpy as np
+
+STRATEGIES = ('none', 'partial', 'scaled', 'rook', 'complete')
+
+
+def scale_factors(matrix, ncols=None):
+    """Largest magnitude in each row of the coefficient columns (zero rows get 1)."""
+    matrix = np.asarray(matrix, dtype=float)
+    coefficients = matrix[:, :ncols]
+    # row maxima of |entry| without a full-size np.abs temporary
+    scales = (np.maximum(coefficients.max(axis=1), -coefficients.min(axis=1)) if matrix.size
+              else np.zeros(len(matrix)))
+    scales[scales == 0] = 1.0
+    return scales
+
+
+class Pivoter:
+    """Pivot search and row/column interchanges on a working matrix.
+
+    ``ncols`` is the number of coefficient columns (the rest, e.g. the
+    right-hand side of an augmented matrix, is never searched or swapped
+    as a column). Scale factors for 'scaled' pivoting are computed once and
+    swapped with their rows, so each search is O(n) for 'partial',
+    'scaled' and (per round) 'rook', and O(n^2) for 'complete'.
+    ``row_perm`` and ``col_perm`` record the interchanges.
+    """
+
+    def __init__(self, matrix, strategy='partial', ncols=None, scales=None):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown pivoting strategy '{strategy}', expected one of {STRATEGIES}")
+        self.matrix = matrix
+        self.strategy = strategy
+        self.ncols = matrix.shape[1] if ncols is None else ncols
+        self.scales = None
+        if strategy == 'scaled':
+            self.scales = scale_factors(matrix, self.ncols) if scales is None else np.array(scales, dtype=float)
+        self.row_perm = np.arange(len(matrix))
+        self.col_perm = np.arange(self.ncols)
+
+    @property
+    def permutes_columns(self):
+        return self.strategy in ('rook', 'complete')
+
+    def find(self, k):
+        """Position ``(row, col)`` of the pivot for step ``k``."""
+        M = self.matrix
+        if self.strategy == 'none':
+            return k, k
+        if self.strategy == 'partial':
+            return k + np.abs(M[k:, k]).argmax(), k
+        if self.strategy == 'scaled':
+            return k + (np.abs(M[k:, k]) / self.scales[k:]).argmax(), k
+        if self.strategy == 'complete':
+            block = np.abs(M[k:, k:self.ncols])
+            row, col = np.unravel_index(block.argmax(), block.shape)
+            return k + row, k + col
+
+        # rook: alternate row and column searches until the entry is the
+        # largest in both; its magnitude grows every round, so this stops
+        row, col = k + np.abs(M[k:, k]).argmax(), k
+        while True:
+            new_col = k + np.abs(M[row, k:self.ncols]).argmax()
+            if abs(M[row, new_col]) <= abs(M[row, col]):
+                return row, col
+            col = new_col
+            new_row = k + np.abs(M[k:, col]).argmax()
+            if abs(M[new_row, col]) <= abs(M[row, col]):
+                return row, col
+            row = new_row
+
+    def swap_rows(self, i, j):
+        if i != j:
+            self.matrix[[i, j]] = self.matrix[[j, i]]
+            self.row_perm[[i, j]] = self.row_perm[[j, i]]
+            if self.scales is not None:
+                self.scales[[i, j]] = self.scales[[j, i]]
+
+    def swap_columns(self, i, j):
+        if i != j:
+            self.matrix[:, [i, j]] = self.matrix[:, [j, i]]
+            self.col_perm[[i, j]] = self.col_perm[[j, i]]
+
+    def apply(self, k):
+        """Move the pivot of step ``k`` to position (k, k); returns where it came from."""
+        row, col = self.find(k)
+        self.swap_rows(k, row)
+        self.swap_columns(k, col)
+        return row, col
+
+    def unpermute(self, x):
+        """Reorder a solution of the column-permuted system back to the original unknowns."""
+        if not self.permutes_columns:
+            return x
+        result = np.empty_like(x)
+        result[self.col_perm] = x
+        return result
@@ -0,0 +1,19 @@
+import numpy as np
+
+# Largest temporary, in elements, that a rank-one update may allocate. A
+# single np.outer over the trailing block is as large as the block itself
+# (a full n x n copy at the first step), which doubles peak memory for an
+# in-place factorization; row chunks keep it at about 512 KiB instead.
+CHUNK_ELEMENTS = 1 << 16
+
+
+def subtract_outer(M, u, v):
+    """``M -= np.outer(u, v)`` in place, with a bounded temporary."""
+    rows = max(1, CHUNK_ELEMENTS // max(1, len(v)))
+    buffer = np.empty((min(rows, len(u)), len(v)), dtype=np.result_type(M, u, v))
+    for start in range(0, len(u), rows):
+        stop = min(start + rows, len(u))
+        part = buffer[:stop - start]
+        np.multiply.outer(u[start:stop], v, out=part)
+        M[start:stop] -= part
+    return M
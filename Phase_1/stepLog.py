@@ -0,0 +1,122 @@
+from array import array
+
+import numpy as np
+
+ELIMINATE = 0
+SWAP = 1
+
+
+class StepLog:
+    """Step trace of a row-operation algorithm that stores deltas, not matrices.
+
+    Each step is a list of row operations: a row swap, or "rows
+    ``a .. a+count-1`` minus multipliers times row ``source``" from a pivot
+    column on. A step costs a few integers plus its multipliers. A full
+    matrix is kept only at checkpoints every ``checkpoint_interval``
+    operations. ``log[k]`` rebuilds the matrix after step ``k`` (step 0 is
+    the initial matrix) by replaying operations from the nearest
+    checkpoint. By default about 32 checkpoints are spread over
+    ``expected_ops`` operations, which defaults to one operation per row
+    update of an n x n elimination (n^2 / 2).
+    """
+
+    def __init__(self, initial, checkpoint_interval=None, expected_ops=None):
+        self.current = np.array(initial, dtype=float)
+        n = len(self.current)
+        if expected_ops is None:
+            expected_ops = n * n // 2
+        self.checkpoint_interval = checkpoint_interval or max(1, expected_ops // 32)
+
+        self.kinds = array('b')
+        self.rows = array('q')
+        self.counts = array('q')
+        self.sources = array('q')
+        self.cols = array('q')
+        self.factor_offsets = array('q')
+        self.factors = array('d')
+
+        self.step_ends = array('q', [0])
+        self.checkpoints = [(0, self.current.copy())]
+        self.cursor = None
+
+    def __len__(self):
+        return len(self.step_ends)
+
+    # -- recording -------------------------------------------------------
+
+    def record(self, kind, row, count, source, col, factors=(), applied=False):
+        self.kinds.append(kind)
+        self.rows.append(row)
+        self.counts.append(count)
+        self.sources.append(source)
+        self.cols.append(col)
+        self.factor_offsets.append(len(self.factors))
+        self.factors.extend(factors)
+        if not applied:
+            self.apply(self.current, len(self.kinds) - 1)
+
+    def eliminate(self, row, source, factors, col):
+        """Subtract ``factors[i] * M[source]`` from ``M[row + i]`` right of ``col`` and clear ``col``."""
+        factors = np.atleast_1d(np.asarray(factors, dtype=float))
+        self.record(ELIMINATE, row, len(factors), source, col, factors)
+
+    def swap(self, i, j, applied=False):
+        """Swap rows ``i`` and ``j``; ``applied`` records a swap already done on ``current``."""
+        if i != j:
+            self.record(SWAP, i, 1, j, 0, applied=applied)
+
+    def end_step(self):
+        ops = len(self.kinds)
+        self.step_ends.append(ops)
+        if ops - self.checkpoints[-1][0] >= self.checkpoint_interval:
+            self.checkpoints.append((ops, self.current.copy()))
+
+    # -- replay ----------------------------------------------------------
+
+    def apply(self, M, op):
+        row, count, source = self.rows[op], self.counts[op], self.sources[op]
+        if self.kinds[op] == SWAP:
+            M[[row, source]] = M[[source, row]]
+            return
+        col = self.cols[op]
+        offset = self.factor_offsets[op]
+        factors = np.array(self.factors[offset:offset + count], dtype=float)
+        M[row:row + count, col + 1:] -= np.outer(factors, M[source, col + 1:])
+        M[row:row + count, col] = 0
+
+    def step_operations(self, k):
+        """The recorded operations of step ``k`` as ``(kind, row, count, source, col, factors)``."""
+        ops = []
+        for op in range(self.step_ends[k - 1] if k else 0, self.step_ends[k]):
+            offset = self.factor_offsets[op]
+            factors = list(self.factors[offset:offset + self.counts[op]])
+            kind = 'swap' if self.kinds[op] == SWAP else 'eliminate'
+            ops.append((kind, self.rows[op], self.counts[op], self.sources[op], self.cols[op], factors))
+        return ops
+
+    def __getitem__(self, k):
+        if k < 0:
+            k += len(self)
+        if not 0 <= k < len(self):
+            raise IndexError("step index out of range")
+        target = self.step_ends[k]
+
+        start, matrix = max((c for c in self.checkpoints if c[0] <= target), key=lambda c: c[0])
+        if self.cursor is not None and start <= self.cursor[0] <= target:
+            start, matrix = self.cursor
+        else:
+            matrix = matrix.copy()
+
+        for op in range(start, target):
+            self.apply(matrix, op)
+        self.cursor = (target, matrix)
+        return matrix.copy()
+
+    def iter_matrices(self):
+        """Yield the matrix after every step, replayed in one working buffer."""
+        matrix = self.checkpoints[0][1].copy()
+        yield matrix
+        for k in range(1, len(self)):
+            for op in range(self.step_ends[k - 1], self.step_ends[k]):
+                self.apply(matrix, op)
+            yield matrix
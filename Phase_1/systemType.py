@@ -0,0 +1,102 @@
+import numpy as np
+
+from exactSolver import exact_ranks
+from rankOneUpdate import subtract_outer
+
+# Headroom on the rounding bound of elimination_ranks. Rounding in the rows
+# left without a pivot reaches them amplified by the pivot block, which the
+# bound does not see; with less headroom, a few percent of random
+# rank-deficient systems with b = A @ x came out as 'no solution'.
+ROUNDING_HEADROOM = 128
+
+
+def elimination_ranks(A, b, tol=None, block_size=64):
+    """Ranks of ``A`` and ``[A|b]`` from one forward elimination with partial pivoting.
+
+    A column whose largest remaining entry is at most ``tol``, or at most a
+    running bound on the rounding error elimination has put into the
+    remaining rows, counts as dependent. The right-hand side of a row left
+    without a pivot is compared against the same bound for that row.
+    Columns are eliminated ``block_size`` at a time, and the columns to the
+    right get the whole block's update as one matrix product.
+    Returns ``(rank_A, rank_Aug, pivots)``.
+    """
+    Ab = np.column_stack((A, b)).astype(float)
+    m, n = Ab.shape[0], Ab.shape[1] - 1
+    if tol is None:
+        tol = max(m, n + 1) * np.finfo(float).eps * (np.max(np.abs(Ab)) if Ab.size else 0)
+    # magnitude each row has accumulated: its largest entry plus |factor| times the largest entry of each pivot row subtracted
+    bound = np.max(np.abs(Ab), axis=1) if Ab.size else np.zeros(m)
+    scale = ROUNDING_HEADROOM * max(m, n + 1) * np.finfo(float).eps
+
+    rank = 0
+    pivots = []
+    for start in range(0, n, block_size):
+        if rank == m:
+            break
+        stop = min(start + block_size, n)
+        top = rank
+        pivot_cols = []
+        for col in range(start, stop):
+            if rank == m:
+                break
+            p = rank + np.argmax(np.abs(Ab[rank:, col]))
+            if abs(Ab[p, col]) <= max(tol, scale * np.max(bound[rank:])):
+                continue
+            if p != rank:
+                Ab[[rank, p]] = Ab[[p, rank]]
+                bound[[rank, p]] = bound[[p, rank]]
+            factors = Ab[rank + 1:, col] / Ab[rank, col]
+            bound[rank + 1:] += np.abs(factors) * np.max(np.abs(Ab[rank, col:stop]))
+            subtract_outer(Ab[rank + 1:, col + 1:stop], factors, Ab[rank, col + 1:stop])
+            # the multipliers stay below the pivot for the block update
+            Ab[rank + 1:, col] = factors
+            pivots.append(abs(Ab[rank, col]))
+            pivot_cols.append(col)
+            rank += 1
+
+        k = len(pivot_cols)
+        if k:
+            L = np.tril(Ab[top:, pivot_cols], -1)
+            L[:k] += np.eye(k)
+            U = np.linalg.solve(L[:k], Ab[top:rank, stop:])
+            Ab[top:rank, stop:] = U
+            Ab[rank:, stop:] -= L[k:] @ U
+            bound[rank:] += np.abs(L[k:]) @ np.max(np.abs(U), axis=1)
+
+    rhs_tol = np.maximum(tol, scale * bound[rank:])
+    inconsistent = rank < m and bool(np.any(np.abs(Ab[rank:, n]) > rhs_tol))
+    return rank, rank + int(inconsistent), pivots
+
+
+def svd_ranks(A, b):
+    return np.linalg.matrix_rank(A), np.linalg.matrix_rank(np.column_stack((A, b)))
+
+
+def classify_system(A, b, tol=None, svd_fallback=False, exact=False):
+    """Return ``'unique'``, ``'infinite'`` or ``'no solution'`` for ``A x = b``.
+
+    The ranks come from elimination. With ``svd_fallback=True`` they are
+    re-checked with the two SVD ranks when rows are left without a pivot, or
+    when the pivots are too close to the tolerance for elimination to be
+    trusted; those are the cases rounding can tip either way. With ``exact=True``
+    (integer or rational entries only) they come from fraction-free
+    elimination, with no tolerance.
+    """
+    if exact:
+        rank_A, rank_Aug = exact_ranks(A, b)
+        n = np.shape(A)[1]
+        return 'no solution' if rank_A != rank_Aug else 'unique' if rank_A == n else 'infinite'
+
+    A = np.asarray(A, dtype=float)
+    rank_A, rank_Aug, pivots = elimination_ranks(A, b, tol)
+    ambiguous = rank_A < A.shape[0] or (
+        len(pivots) > 0 and min(pivots) < np.sqrt(np.finfo(float).eps) * max(pivots))
+    if svd_fallback and ambiguous:
+        rank_A, rank_Aug = svd_ranks(A, b)
+
+    if rank_A != rank_Aug:
+        return 'no solution'
+    if rank_A == A.shape[1]:
+        return 'unique'
+    return 'infinite'
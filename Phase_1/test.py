@@ -0,0 +1,692 @@
+import os
+import sys
+
+import numpy as np
+
+here = os.path.dirname(os.path.abspath(__file__))
+sys.path += [os.path.join(here, 'gauss'), os.path.join(here, 'methods')]
+
+from GaussElimination import gauss, gauss_generator, gauss_gordon
+
+
+def random_system(n, seed=0):
+    rng = np.random.default_rng(seed)
+    A = rng.standard_normal((n, n)) + n * np.eye(n)
+    b = rng.standard_normal(n)
+    return A, b
+
+
+def test_gauss_matches_numpy():
+    A, b = random_system(50)
+    expected = np.linalg.solve(A, b)
+    assert np.allclose(gauss(A, b, True), expected)
+    assert np.allclose(gauss_gordon(A, b, False), expected)
+
+
+def test_gauss_generator_steps():
+    A, b = random_system(6)
+    steps = [step.copy() for step in gauss_generator(A, b, True)]
+
+    # one step per pivot plus the final solution matrix
+    assert len(steps) == len(b)
+    assert np.allclose(np.tril(steps[-2][:, :-1], -1), 0)
+    assert np.allclose(steps[-1][:, -1], gauss(A, b, True))
+
+
+def test_lu_factorization_solves_many_right_hand_sides():
+    from LU.LU import LUFactorization
+
+    A, _ = random_system(40, seed=1)
+    B = np.random.default_rng(2).standard_normal((40, 7))
+    factorization = LUFactorization(A)
+
+    assert np.allclose(factorization.solve(B), np.linalg.solve(A, B))
+    assert np.allclose(factorization.solve(B[:, 0]), np.linalg.solve(A, B[:, 0]))
+
+
+def test_packed_lu_pivots_and_overwrites():
+    from LU.LU import LUFactorization
+
+    A = np.array([[0, 2, 1], [1, 1, 1], [4, 1, 0]], dtype=float)
+    buffer = A.copy()
+    factorization = LUFactorization(buffer, overwrite_a=True)
+
+    assert factorization.lu is buffer
+    assert np.allclose(factorization.P @ A, factorization.L @ factorization.U)
+    assert np.allclose(factorization.solve([1, 2, 3]), np.linalg.solve(A, [1, 2, 3]))
+
+
+def test_in_place_lu_keeps_temporaries_small():
+    import tracemalloc
+    import rankOneUpdate
+    from LU.LU import lu_factor, lu_solve
+
+    A, _ = random_system(400, seed=3)
+    expected = np.linalg.solve(A, np.ones(400))
+    chunk, rankOneUpdate.CHUNK_ELEMENTS = rankOneUpdate.CHUNK_ELEMENTS, 4096
+    try:
+        tracemalloc.start()
+        lu, perm = lu_factor(A, overwrite_a=True)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    finally:
+        rankOneUpdate.CHUNK_ELEMENTS = chunk
+    assert np.allclose(lu_solve(lu, perm, np.ones(400)), expected)
+    assert lu is A
+    assert peak < A.nbytes / 4
+
+
+def test_factorization_cache_hits_and_evicts():
+    from factorizationCache import FactorizationCache
+    from croutDecomposition import lu_decomposition_crout
+
+    cache = FactorizationCache(max_entries=2)
+    matrices = [random_system(5, seed)[0] for seed in range(3)]
+
+    first = cache.get_or_factor(matrices[0], 'crout', lu_decomposition_crout)
+    assert cache.get_or_factor(matrices[0].copy(), 'crout', lu_decomposition_crout) is first
+    for A in matrices[1:]:
+        cache.get_or_factor(A, 'crout', lu_decomposition_crout)
+
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['evictions'], stats['entries']) == (1, 3, 1, 2)
+
+
+def test_lu_factorization_cached_reuses_shared_cache():
+    from LU.LU import LUFactorization
+    from factorizationCache import get_cache
+
+    A, b = random_system(30, seed=7)
+    before = get_cache().stats()
+    factorization = LUFactorization.cached(A)
+    assert LUFactorization.cached(A.copy()) is factorization
+    assert LUFactorization.cached(A, tol=1e-6) is not factorization
+    after = get_cache().stats()
+
+    assert (after['hits'] - before['hits'], after['misses'] - before['misses']) == (1, 2)
+    assert np.allclose(factorization.solve(b), np.linalg.solve(A, b))
+
+
+def test_classify_system_from_elimination():
+    from systemType import classify_system
+
+    A = np.array([[25, 5, 1], [25, 5, 1], [144, 12, 1]], dtype=float)
+    assert classify_system(A, [1, 1, 3]) == 'infinite'
+    assert classify_system(A, [1, 2, 3]) == 'no solution'
+    assert classify_system(A + np.diag([0, 1, 0]), [1, 1, 3]) == 'unique'
+    assert classify_system(A, [1, 2, 3], svd_fallback=True) == 'no solution'
+
+
+def test_classify_consistent_low_rank_float_systems():
+    from systemType import classify_system
+
+    rng = np.random.default_rng(5)
+    for n, r in [(6, 3), (40, 12), (80, 79)]:
+        A = rng.standard_normal((n, r)) @ rng.standard_normal((r, n))
+        b = A @ rng.standard_normal(n)
+        assert classify_system(A, b) == 'infinite'
+        assert classify_system(A, b + 1e-6 * np.linalg.norm(b) * rng.standard_normal(n)) == 'no solution'
+
+
+def test_classify_system_skips_svd_by_default():
+    import systemType
+
+    rng = np.random.default_rng(6)
+    svd_ranks, systemType.svd_ranks = systemType.svd_ranks, None
+    try:
+        # more columns than one elimination block, full rank and rank deficient
+        A = rng.standard_normal((300, 300))
+        assert systemType.elimination_ranks(A, rng.standard_normal(300))[:2] == (300, 300)
+        A[:, 150:] = A[:, :150] @ rng.standard_normal((150, 150))
+        b = A @ rng.standard_normal(300)
+        assert systemType.classify_system(A, b) == 'infinite'
+        assert systemType.classify_system(A, b + 1e-9 * np.abs(b).max() * rng.standard_normal(300)) == 'no solution'
+    finally:
+        systemType.svd_ranks = svd_ranks
+
+
+def test_forward_elimination_next_step_resumes():
+    from Forward_elimination import forward_eliminator
+
+    A, b = random_system(8, seed=3)
+    Ab = np.column_stack((A, b))
+    eliminator = forward_eliminator(Ab.copy(), list(np.max(np.abs(A), axis=1)))
+    steps = 0
+    while True:
+        flag, arr = eliminator.Forward_Elimination_nextStep()
+        steps += 1
+        if flag:
+            break
+
+    assert steps <= 8 * 7 // 2 + 8 + 1
+    assert np.allclose(np.tril(arr[:, :-1], -1), 0)
+
+
+def test_step_log_reconstructs_generator_steps():
+    from GaussElimination import forward_elimination_generator, forward_elimination_log
+
+    A, b = random_system(12, seed=4)
+    expected = [Ab.copy() for Ab in forward_elimination_generator(A, b, True)]
+    log = forward_elimination_log(A, b, True, checkpoint_interval=3)
+
+    assert len(log) == len(expected) + 1
+    for k in [5, 2, 11, 1, 7]:
+        assert np.array_equal(log[k], expected[k - 1])
+    assert np.allclose(list(log.iter_matrices())[-1], expected[-1])
+
+
+def test_step_log_default_checkpoints_and_zero_pivot():
+    from GaussElimination import forward_elimination, forward_elimination_log
+
+    A, b = random_system(200, seed=4)
+    log = forward_elimination_log(A, b, True)
+    assert 16 <= len(log.checkpoints) <= 40
+    assert np.array_equal(log[len(log) - 1], forward_elimination(A, b, True))
+
+    singular = np.array([[1.0, 1, 1], [1, 1, 2], [0, 0, 1]])
+    for eliminate in (forward_elimination, forward_elimination_log):
+        try:
+            eliminate(singular, np.ones(3), False, strategy='none')
+            assert False, "zero pivot should be rejected"
+        except ValueError as error:
+            assert 'Zero pivot' in str(error)
+
+
+def test_lu_step_log_matches_generator_steps():
+    from LU.LU import LU
+
+    A, b = random_system(10, seed=6)
+    expected = list(LU(A, b).get_U_generator())
+    log = LU(A, b).get_U_log(checkpoint_interval=4)
+
+    # the generator also yields the finished U again at the end; the log clears
+    # eliminated entries to zero where the generator leaves rounding residue
+    assert len(log) == len(expected) - 1
+    for k in [0, 17, 3, 44, 8, len(log) - 1]:
+        assert np.array_equal(np.triu(log[k]), np.triu(expected[k]))
+        assert np.allclose(log[k], expected[k], rtol=0, atol=1e-12)
+    assert np.array_equal(np.tril(log[len(log) - 1], -1), np.zeros((10, 10)))
+
+
+def test_jacobi_and_gauss_seidel_converge():
+    from iterationMethods import JacobiSolver, GaussSeidelSolver
+
+    A, b = random_system(150, seed=5)
+    A += np.diag(np.abs(A).sum(axis=1))
+    expected = np.linalg.solve(A, b)
+
+    assert np.allclose(JacobiSolver(A, b).solve_by_error(1e-12), expected)
+    assert np.allclose(GaussSeidelSolver(A, b, block_size=16).solve_by_error(1e-12), expected)
+
+
+def test_jacobi_results_are_not_its_work_buffers():
+    from iterationMethods import JacobiSolver
+
+    A = np.array([[4.0, 1.0], [1.0, 3.0]])
+    solver = JacobiSolver(A, [1.0, 2.0])
+    x = solver.solve_by_iterations(1)
+    solver.nextStep()
+    solver.nextStep()
+    assert np.allclose(x, [0.25, 2 / 3])
+    converged = solver.solve_by_error(1e-12)
+    solver.nextStep()
+    assert converged is not solver.x and converged is not solver.x_next
+
+
+def test_iterative_solvers_accept_csr():
+    from iterationMethods import JacobiSolver, GaussSeidelSolver
+    from sparseMatrix import CSRMatrix
+
+    n = 300
+    dense = 4 * np.eye(n) - np.eye(n, k=1) - np.eye(n, k=-1)
+    A = CSRMatrix.from_dense(dense)
+    b = np.ones(n)
+    expected = np.linalg.solve(dense, b)
+
+    assert A.nnz == 3 * n - 2
+    assert np.allclose(JacobiSolver(A, b).solve_by_error(1e-12), expected)
+    assert np.allclose(GaussSeidelSolver(A, b).solve_by_error(1e-12), expected)
+
+
+def test_conjugate_gradient_with_preconditioners():
+    from iterationMethods import ConjugateGradientSolver
+    from sparseMatrix import CSRMatrix
+
+    n = 200
+    dense = 2 * np.eye(n) - np.eye(n, k=1) - np.eye(n, k=-1) + 1e-2 * np.eye(n)
+    b = np.ones(n)
+    expected = np.linalg.solve(dense, b)
+
+    plain = ConjugateGradientSolver(dense, b)
+    x = plain.solve_by_error(1e-12)
+    assert np.allclose(x, expected)
+
+    for A in (dense, CSRMatrix.from_dense(dense)):
+        for preconditioner in ('jacobi', 'ichol'):
+            solver = ConjugateGradientSolver(A, b, preconditioner=preconditioner)
+            assert np.allclose(solver.solve_by_error(1e-12), expected)
+
+    # IC(0) of a tridiagonal matrix is exact, so one step is enough
+    assert np.allclose(ConjugateGradientSolver(dense, b, preconditioner='ichol').solve_by_iterations(1), expected)
+    assert np.allclose(ConjugateGradientSolver(dense, b, x0=expected).solve_by_iterations(1), expected)
+
+
+def test_gmres_and_bicgstab_on_nonsymmetric_system():
+    from iterationMethods import GMRESSolver, BiCGSTABSolver, JacobiSolver
+
+    n = 120
+    rng = np.random.default_rng(6)
+    A = np.eye(n) + rng.standard_normal((n, n)) / (2 * np.sqrt(n))
+    A[np.arange(n), np.arange(n)] = 0.5
+    b = rng.standard_normal(n)
+    expected = np.linalg.solve(A, b)
+
+    gmres = GMRESSolver(A, b, restart=40, preconditioner='ilu0')
+    assert np.allclose(gmres.solve_by_error(1e-12), expected)
+    assert gmres.residual_history[-1] < 1e-8 * gmres.residual_history[0]
+
+    matrix_free = BiCGSTABSolver(lambda v: A @ v, b)
+    assert np.allclose(matrix_free.solve_by_error(1e-12), expected)
+
+    try:
+        JacobiSolver(A, b).solve_by_error(1e-12, max_iterations=200)
+        assert False, "Jacobi should not converge on this system"
+    except ValueError:
+        pass
+
+
+def test_preconditioners_on_linear_operator():
+    from iterationMethods import GMRESSolver
+    from sparseMatrix import LinearOperator
+
+    n = 100
+    A = np.diag(np.arange(1.0, n + 1)) + np.eye(n, k=1)
+    b = np.ones(n)
+    operator = LinearOperator((n, n), lambda v: A @ v, diagonal=np.diag(A))
+    solver = GMRESSolver(operator, b, preconditioner='jacobi')
+    assert np.allclose(solver.solve_by_error(1e-12), np.linalg.solve(A, b))
+
+    for preconditioner in ('ilu0', 'ichol'):
+        try:
+            GMRESSolver(operator, b, preconditioner=preconditioner)
+            assert False
+        except ValueError as error:
+            assert 'matrix-free' in str(error)
+
+
+def test_spectral_radius_precheck_fails_fast_or_reroutes():
+    from iterationMethods import JacobiSolver, GMRESSolver
+
+    n = 60
+    rng = np.random.default_rng(6)
+    A = np.eye(n) + rng.standard_normal((n, n)) / (2 * np.sqrt(n))
+    A[np.arange(n), np.arange(n)] = 0.5
+    b = rng.standard_normal(n)
+
+    D = np.diag(np.diag(A))
+    true_radius = max(abs(np.linalg.eigvals(np.eye(n) - np.linalg.solve(D, A))))
+    solver = JacobiSolver(A, b)
+    estimate = solver.convergence_estimate(1e-10, num_steps=60)
+    assert not estimate['converges']
+    assert abs(estimate['spectral_radius'] - true_radius) < 0.1 * true_radius
+
+    try:
+        JacobiSolver(A, b).solve_by_error(1e-10, precheck=True)
+        assert False, "divergent system should be rejected"
+    except ValueError as error:
+        assert 'spectral radius' in str(error)
+
+    rerouted = JacobiSolver(A, b).solve_by_error(1e-12, precheck=True, fallback=GMRESSolver)
+    assert np.allclose(rerouted, np.linalg.solve(A, b))
+
+
+def test_sor_red_black_on_grid():
+    from iterationMethods import GaussSeidelSolver, SORSolver
+    from sparseMatrix import CSRMatrix
+
+    m = 12
+    T = 2 * np.eye(m) - np.eye(m, k=1) - np.eye(m, k=-1)
+    dense = np.kron(T, np.eye(m)) + np.kron(np.eye(m), T)
+    A = CSRMatrix.from_dense(dense)
+    b = np.ones(m * m)
+    expected = np.linalg.solve(dense, b)
+
+    def sweeps(solver):
+        count = 0
+        while np.linalg.norm(dense @ solver.x - b) > 1e-8:
+            solver.nextStep()
+            count += 1
+        return count
+
+    red_black = SORSolver(A, b, ordering='red-black')
+    assert len(red_black.colors) == 2
+    assert 1 < red_black.omega < 2
+    assert sweeps(red_black) < sweeps(GaussSeidelSolver(A, b)) / 2
+    assert np.allclose(red_black.x, expected)
+    assert np.allclose(SORSolver(dense, b, omega=1.5).solve_by_error(1e-12), expected)
+
+
+def test_solve_by_error_check_cadence_and_history():
+    from iterationMethods import JacobiSolver
+
+    A, b = random_system(80, seed=7)
+    A += np.diag(np.abs(A).sum(axis=1))
+    expected = np.linalg.solve(A, b)
+
+    every = JacobiSolver(A, b)
+    every.solve_by_error(1e-12, history=True)
+    assert np.all(np.diff(every.history) < 0)
+
+    buffer = np.zeros(1000)
+    sparse_checks = JacobiSolver(A, b)
+    assert np.allclose(sparse_checks.solve_by_error(1e-12, check_every=5, history=buffer), expected)
+    assert sparse_checks.history.base is buffer
+    assert len(sparse_checks.history) <= len(every.history) // 5 + 1
+
+
+def test_blocked_cholesky_without_eigenvalue_check():
+    from cholsekyDecomposition import blocked_cholesky, cholesky_decomposition
+
+    rng = np.random.default_rng(8)
+    B = rng.standard_normal((150, 150))
+    A = B @ B.T + 150 * np.eye(150)
+
+    lower_only = np.tril(A)
+    L = blocked_cholesky(lower_only, block_size=16, overwrite_a=True)
+    assert L is lower_only
+    assert np.allclose(L, np.linalg.cholesky(A))
+    full = A.copy()
+    assert blocked_cholesky(full, block_size=16, overwrite_a=True) is full
+    assert np.allclose(full, np.linalg.cholesky(A))
+    assert np.allclose(cholesky_decomposition(A)[0], np.linalg.cholesky(A))
+
+    try:
+        cholesky_decomposition(A - 1000 * np.eye(150))
+        assert False, "indefinite matrix should be rejected"
+    except ValueError as error:
+        assert 'positive definite' in str(error)
+
+
+def test_crout_fills_caller_buffers():
+    from croutDecomposition import lu_decomposition_crout, solve_system
+
+    A, b = random_system(60, seed=9)
+    L, U = np.full_like(A, np.nan), np.full_like(A, np.nan)
+    L_out, U_out = lu_decomposition_crout(A, L, U)
+
+    assert L_out is L and U_out is U
+    assert np.allclose(L @ U, A)
+    assert np.allclose(np.diag(U), 1) and np.allclose(np.triu(L, 1), 0) and np.allclose(np.tril(U, -1), 0)
+    assert np.allclose(solve_system(A, b, use_cache=False), np.linalg.solve(A, b))
+
+
+def test_batched_solvers_flag_singular_items():
+    from batchedSolvers import batched_cholesky_system, batched_gauss, batched_lu
+
+    rng = np.random.default_rng(10)
+    A = rng.standard_normal((50, 4, 4))
+    A[7] = [[1, 2, 3, 4], [2, 4, 6, 8], [0, 1, 0, 1], [1, 0, 1, 0]]
+    B = rng.standard_normal((50, 4, 3))
+
+    for solve in (batched_lu, batched_gauss):
+        X, singular = solve(A, B)
+        assert np.flatnonzero(singular).tolist() == [7]
+        assert np.isnan(X[7]).all()
+        mask = ~singular
+        assert np.allclose(X[mask], np.linalg.solve(A[mask], B[mask]))
+
+    x, _ = batched_gauss(A, B[..., 0], use_scaling=True)
+    assert np.allclose(x[0], np.linalg.solve(A[0], B[0, :, 0]))
+
+    S = A @ A.transpose(0, 2, 1) + np.eye(4)
+    S[3] = -np.eye(4)
+    X, failed = batched_cholesky_system(S, B)
+    assert np.flatnonzero(failed).tolist() == [3]
+    assert np.allclose(X[~failed], np.linalg.solve(S[~failed], B[~failed]))
+
+
+def test_banded_and_thomas_solvers():
+    from bandedSolvers import dense_to_banded, detect_bandwidth, solve_banded, thomas
+
+    n = 300
+    rng = np.random.default_rng(11)
+    A = np.triu(np.tril(rng.standard_normal((n, n)), 3), -2) + 2 * np.eye(n)
+    A[0, 0] = 0  # forces a row swap inside the band
+    b = rng.standard_normal(n)
+
+    assert detect_bandwidth(A) == (2, 3)
+    assert np.allclose(solve_banded(dense_to_banded(A, 2, 3), 2, 3, b), np.linalg.solve(A, b))
+    assert np.allclose(gauss(A, b, True), np.linalg.solve(A, b))
+
+    T = 4 * np.eye(n) - np.eye(n, k=1) - np.eye(n, k=-1)
+    assert np.allclose(thomas(-np.ones(n - 1), 4 * np.ones(n), -np.ones(n - 1), b), np.linalg.solve(T, b))
+
+
+def test_level_scheduled_triangular_solves():
+    from sparseMatrix import CSRMatrix, TriangularSolver
+
+    rng = np.random.default_rng(10)
+    n = 80
+    D = np.tril(rng.standard_normal((n, n)) * (rng.random((n, n)) < 0.05), -1) + np.diag(rng.random(n) + 1)
+    r = rng.standard_normal(n)
+    lower = TriangularSolver(CSRMatrix.from_dense(D), lower=True, diagonal=np.diag(D))
+    assert len(lower.levels) < n
+    assert np.allclose(lower.solve(r.copy()), np.linalg.solve(D, r))
+    upper = TriangularSolver(CSRMatrix.from_dense(D.T), lower=False, diagonal=np.diag(D))
+    assert np.allclose(upper.solve(r.copy()), np.linalg.solve(D.T, r))
+    unit = TriangularSolver(CSRMatrix.from_dense(D), lower=True)
+    assert np.allclose(unit.solve(r.copy()), np.linalg.solve(np.tril(D, -1) + np.eye(n), r))
+
+def test_dispatcher_routes_by_structure():
+    from dispatcher import solve
+
+    n = 120
+    rng = np.random.default_rng(12)
+    B = rng.standard_normal((n, n))
+    b = rng.standard_normal(n)
+    T = 4 * np.eye(n) - np.eye(n, k=1) - np.eye(n, k=-1)
+    cases = {
+        'banded': T,
+        'cholesky': B @ B.T + n * np.eye(n),
+        'lu': B + n * np.eye(n),
+    }
+    for method, A in cases.items():
+        x, report = solve(A, b, report=True)
+        assert report['method'] == method
+        assert report['reasons'] and report['timings']['total'] >= 0
+        assert np.allclose(x, np.linalg.solve(A, b))
+
+    from sparseMatrix import CSRMatrix
+    x, report = solve(CSRMatrix.from_dense(T), b, report=True)
+    assert report['method'] == 'banded'
+    assert np.allclose(x, np.linalg.solve(T, b))
+
+    # periodic coupling makes the band as wide as the matrix
+    periodic = T.copy()
+    periodic[0, -1] = periodic[-1, 0] = -1
+    x, report = solve(CSRMatrix.from_dense(periodic), b, report=True)
+    assert report['method'] == 'cg'
+    assert np.allclose(x, np.linalg.solve(periodic, b))
+
+    # matrix right-hand sides are solved column by column
+    X, report = solve(CSRMatrix.from_dense(periodic), B[:, :3], report=True)
+    assert report['method'] == 'cg' and len(report['reasons']) == 1
+    assert np.allclose(X, np.linalg.solve(periodic, B[:, :3]))
+
+
+def test_dispatcher_sends_sparse_band_matrices_to_band_solver():
+    from dispatcher import solve
+    from sparseMatrix import CSRMatrix
+
+    # indefinite but nonsingular tridiagonal matrix, stored sparse
+    n = 2001
+    T = np.diag(np.linspace(-2, 2, n) + 0.01) + np.eye(n, k=1) + np.eye(n, k=-1)
+    b = np.random.default_rng(19).standard_normal(n)
+    A = CSRMatrix.from_dense(T)
+    assert A.bandwidth() == (1, 1)
+    x, report = solve(A, b, report=True)
+    assert report['method'] == 'banded'
+    assert np.allclose(T @ x, b)
+
+
+
+def test_dispatcher_falls_back_when_iteration_fails():
+    from dispatcher import solve
+    from sparseMatrix import CSRMatrix
+
+    # cyclic shift with b = e_1: ILU(0) breaks down on the zero diagonal and
+    # restarted GMRES makes no progress at all, so the iterative solve raises
+    n = 200
+    P = np.roll(np.eye(n), 1, axis=1)
+    b = np.zeros(n)
+    b[0] = 1
+    x, details = solve(CSRMatrix.from_dense(P), b, report=True)
+    assert details['method'] == 'lu'
+    assert 'iterative solve failed' in details['reasons'][-1]
+    assert np.allclose(P @ x, b)
+
+def test_pivoting_strategies_agree():
+    from pivoting import STRATEGIES
+    from LU.LU import LUFactorization
+
+    A, b = random_system(30, seed=13)
+    A[0, 0] = 0
+    expected = np.linalg.solve(A, b)
+    for strategy in STRATEGIES[1:]:
+        assert np.allclose(gauss(A, b, False, strategy=strategy), expected)
+        assert np.allclose(gauss_gordon(A, b, False, strategy=strategy), expected)
+        steps = list(gauss_generator(A, b, False, strategy=strategy))
+        assert np.allclose(steps[-1][:, -1], expected)
+    for strategy in ('partial', 'scaled'):
+        assert np.allclose(LUFactorization(A, strategy=strategy).solve(b), expected)
+
+
+def test_mixed_precision_refinement_and_fallback():
+    from mixedPrecision import MixedPrecisionSolver
+
+    A, b = random_system(60, seed=21)
+    solver = MixedPrecisionSolver(A)
+    assert solver.factors[0].dtype == np.float32
+    assert np.allclose(solver.solve(b), np.linalg.solve(A, b), rtol=1e-12, atol=1e-12)
+    assert solver.converged and not solver.fell_back
+
+    S = A @ A.T + 60 * np.eye(60)
+    solver = MixedPrecisionSolver(S, 'cholesky')
+    assert np.allclose(solver.solve(b), np.linalg.solve(S, b), rtol=1e-12, atol=1e-12)
+
+    # too ill-conditioned for float32 refinement to converge
+    H = 1 / (np.arange(7)[:, None] + np.arange(7) + 1)
+    solver = MixedPrecisionSolver(H)
+    x = solver.solve(H @ np.ones(7))
+    assert solver.fell_back and np.allclose(x, 1, atol=1e-6)
+
+
+def test_out_of_core_factorizations(tmp_path):
+    from outOfCore import open_matrix, solve_out_of_core
+
+    n = 45
+    A, b = random_system(n, seed=22)
+    stored = open_matrix(tmp_path / 'A', n, mode='w+')
+    stored[:] = A
+    budget = 3 * n * 8 * 7  # panels of 7 columns
+    x = solve_out_of_core(stored, b, tmp_path / 'lu', memory_budget=budget, out=tmp_path / 'x')
+    assert isinstance(x, np.memmap)
+    assert np.allclose(x, np.linalg.solve(A, b))
+
+    S = A @ A.T + n * np.eye(n)
+    stored[:] = np.tril(S)
+    x = solve_out_of_core(stored, b, tmp_path / 'L', 'cholesky', memory_budget=budget)
+    assert np.allclose(x, np.linalg.solve(S, b))
+    assert np.allclose(open_matrix(tmp_path / 'L', n), np.linalg.cholesky(S))
+
+
+def test_parallel_tiled_factorizations():
+    from parallelSolvers import parallel_cholesky, parallel_lu_factor
+    from LU.LU import lu_factor, lu_solve
+
+    A, b = random_system(70, seed=23)
+    lu, perm = parallel_lu_factor(A, tile_size=16, workers=4)
+    expected_lu, expected_perm = lu_factor(A)
+    assert np.allclose(lu, expected_lu) and np.array_equal(perm, expected_perm)
+    assert np.allclose(lu_solve(lu, perm, b), np.linalg.solve(A, b))
+
+    S = A @ A.T + 70 * np.eye(70)
+    assert np.allclose(parallel_cholesky(S, tile_size=16, workers=4), np.linalg.cholesky(S))
+    try:
+        parallel_cholesky(-S, tile_size=16)
+        assert False, "negative definite matrix should be rejected"
+    except ValueError as error:
+        assert 'positive definite' in str(error)
+
+
+def test_low_rank_updates_reuse_factorization():
+    from lowRankUpdate import WoodburySolver
+
+    A, b = random_system(64, seed=24)
+    solver = WoodburySolver(A, max_rank=4)
+    solver.update_rows([5], [A[5] + 1])
+    solver.update_entries([1, 1, 9], [0, 2, 9], [3.0, -1.0, 20.0])
+    assert solver.rank == 3 and solver.refactorizations == 1
+    assert np.allclose(solver.solve(b), np.linalg.solve(solver.A, b))
+    solver.update_rows([7, 8], A[[7, 8]] * 2)
+    assert solver.rank == 0 and solver.refactorizations == 2
+    assert np.allclose(solver.solve(b), np.linalg.solve(solver.A, b))
+
+    S = A @ A.T + 64 * np.eye(64)
+    solver = WoodburySolver(S, 'cholesky')
+    solver.update_symmetric(b)
+    solver.update_symmetric(b / 2, sign=-1)
+    assert solver.rank == 0 and solver.refactorizations == 1
+    assert np.allclose(solver.L @ solver.L.T, S + 0.75 * np.outer(b, b))
+    assert np.allclose(solver.solve(b), np.linalg.solve(solver.A, b))
+
+
+def test_low_rank_update_failing_refactor_keeps_state():
+    from lowRankUpdate import WoodburySolver
+
+    solver = WoodburySolver(np.eye(3), max_rank=1)
+    solver.update([1, 0, 0], [0.5, 0, 0])
+    try:
+        # the rank passes max_rank, and refactoring the now singular A fails
+        solver.update([1, 0, 0], [-1.5, 0, 0])
+        assert False
+    except ValueError:
+        pass
+    assert np.allclose(solver.A, np.diag([1.5, 1, 1]))
+    assert np.allclose(solver.solve(np.ones(3)), [2 / 3, 1, 1])
+
+    solver = WoodburySolver(np.eye(3), 'cholesky')
+    try:
+        solver.update_symmetric([2, 0, 0], sign=-1)
+        assert False
+    except ValueError:
+        pass
+    assert np.allclose(solver.A, np.eye(3)) and np.allclose(solver.L, np.eye(3))
+
+
+def test_exact_bareiss_solve_and_classification():
+    from fractions import Fraction
+    from systemType import classify_system
+
+    A = np.array([[25, 5, 1], [64, 8, 1], [144, 12, 1]])
+    b = np.array([1, 2, 3])
+    x = gauss(A, b, False, exact=True)
+    assert list(x) == [Fraction(-1, 84), Fraction(41, 84), Fraction(-8, 7)]
+    assert list(gauss_gordon(A, b, False, exact=True)) == list(x)
+
+    half = Fraction(1, 2)
+    rational = np.array([[half, 1], [1, 3]], dtype=object)
+    assert list(gauss(rational, [1, 2], False, exact=True)) == [2, 0]
+
+    # rank deficiency decided without any tolerance
+    singular = np.array([[1, 2, 3], [4, 5, 6], [7, 8, 9]])
+    assert classify_system(singular, [1, 2, 3], exact=True) == 'infinite'
+    assert classify_system(singular, [1, 2, 4], exact=True) == 'no solution'
+    assert classify_system(A, b, exact=True) == 'unique'
+    from LU.LU import LU
+    assert LU(singular, np.array([1, 2, 4]), exact=True).solution_type == 'no solution'
+    try:
+        gauss(singular, [1, 2, 4], False, exact=True)
+        assert False, "inconsistent system should be rejected"
+    except ValueError as error:
+        assert 'No solution' in str(error)